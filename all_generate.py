@@ -0,0 +1,173 @@
+import argparse
+import os
+import sys
+import time
+import json
+import hashlib
+import subprocess
+from multiprocessing import Pool, cpu_count
+
+
+LOGS_DIR = 'logs'
+INPUT_LOGS = ['transactions', 'debug', 'taskgraph', 'daskvine.log']
+FINGERPRINT_FILENAME = '.all_generate_fingerprint.json'
+# the scripts are part of the fingerprint, a change to them regenerates every run
+STAGE_SCRIPTS = ['generate_d3_input.py', 'graph.py']
+# a log is hashed at its head, middle and tail, small logs are hashed entirely
+HASH_SAMPLE_SIZE = 2**16
+HASH_SAMPLES = 3
+
+
+def sampled_hash(path, size):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(size).encode())
+    with open(path, 'rb') as f:
+        if size <= HASH_SAMPLE_SIZE * HASH_SAMPLES:
+            h.update(f.read())
+        else:
+            for i in range(HASH_SAMPLES):
+                f.seek((size - HASH_SAMPLE_SIZE) * i // (HASH_SAMPLES - 1))
+                h.update(f.read(HASH_SAMPLE_SIZE))
+    return h.hexdigest()
+
+def script_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def load_fingerprint(vine_logs_dir):
+    path = os.path.join(vine_logs_dir, FINGERPRINT_FILENAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_fingerprint(vine_logs_dir, fingerprint):
+    path = os.path.join(vine_logs_dir, FINGERPRINT_FILENAME)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(fingerprint, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+def fingerprint_logs(vine_logs_dir, previous_logs):
+    # size and mtime are compared first, the sampled hash is only computed when they changed,
+    # so that a copied or touched log with the same content is still current
+    logs = {}
+    for log_name in INPUT_LOGS:
+        path = os.path.join(vine_logs_dir, log_name)
+        if not os.path.exists(path):
+            continue
+        stat = os.stat(path)
+        previous = previous_logs.get(log_name)
+        if previous and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+            logs[log_name] = previous
+            continue
+        logs[log_name] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': sampled_hash(path, stat.st_size),
+        }
+    return logs
+
+def same_logs(logs, previous_logs):
+    if logs.keys() != previous_logs.keys():
+        return False
+    return all(logs[name]['size'] == previous_logs[name]['size'] and logs[name]['hash'] == previous_logs[name]['hash'] for name in logs)
+
+def outputs_exist(vine_logs_dir, table_format):
+    return all(os.path.exists(os.path.join(vine_logs_dir, f"{table}.{table_format}")) for table in ['task_done', 'graph_info'])
+
+def stage_commands(run_dir, args, cores):
+    return [
+        ('generate_d3_input', [sys.executable, 'generate_d3_input.py', run_dir, '--format', args.format, '--cores', str(cores)] +
+                              (['--parallel-debug'] if args.parallel_debug else [])),
+        ('graph', [sys.executable, 'graph.py', run_dir, '--save-format', args.save_format, '--cores', str(cores)]),
+    ]
+
+def process_run(job):
+    run_dir, commands = job
+    stage_times = {}
+    for stage, command in commands:
+        time_start = time.time()
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        stage_times[stage] = time.time() - time_start
+        if result.returncode != 0:
+            return run_dir, stage_times, f"{stage} exited with {result.returncode}\n{result.stdout[-4000:]}"
+    return run_dir, stage_times, None
+
+def print_summary(stage_times_by_run, num_skipped, wall_time):
+    if stage_times_by_run:
+        stages = list(next(iter(stage_times_by_run.values())).keys())
+        name_width = max(len('run'), *(len(os.path.basename(run_dir)) for run_dir in stage_times_by_run))
+        print(f"\n{'run':<{name_width}}  " + '  '.join(f"{stage:>18}" for stage in stages) + f"  {'total(s)':>10}")
+        for run_dir, stage_times in sorted(stage_times_by_run.items(), key=lambda item: -sum(item[1].values())):
+            print(f"{os.path.basename(run_dir):<{name_width}}  " + '  '.join(f"{stage_times.get(stage, 0):>18.2f}" for stage in stages) + f"  {sum(stage_times.values()):>10.2f}")
+        print(f"{'all':<{name_width}}  " + '  '.join(f"{sum(times.get(stage, 0) for times in stage_times_by_run.values()):>18.2f}" for stage in stages) +
+              f"  {sum(sum(times.values()) for times in stage_times_by_run.values()):>10.2f}")
+    print(f"\n{len(stage_times_by_run)} runs processed, {num_skipped} up to date, {wall_time:.2f}s")
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logs-dir', type=str, default=LOGS_DIR, help='the directory holding one directory per run')
+    parser.add_argument('--jobs', type=int, default=cpu_count(), help='the number of runs processed at once')
+    parser.add_argument('--force', action='store_true', help='Regenerate every run, even if its outputs are current')
+    parser.add_argument('--format', type=str, default='csv', choices=['csv', 'parquet', 'feather'], help='The format of the generated tables')
+    parser.add_argument('--parallel-debug', action='store_true', help='Scan chunks of the debug logs with multiple processes')
+    parser.add_argument('--save-format', type=str, default='svg', help='The format of the subgraph images')
+    args = parser.parse_args()
+
+    wall_time_start = time.time()
+    logs_dir = os.path.abspath(args.logs_dir)
+    # the stage scripts are run from the directory they live in
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    scripts = {script: script_hash(script) for script in STAGE_SCRIPTS}
+    options = {'format': args.format, 'save_format': args.save_format}
+
+    run_dirs_to_generate, fingerprints, num_skipped = [], {}, 0
+    run_dirs = sorted(os.path.join(logs_dir, name) for name in os.listdir(logs_dir) if os.path.isdir(os.path.join(logs_dir, name)))
+    for run_dir in run_dirs:
+        vine_logs_dir = os.path.join(run_dir, 'vine-logs')
+        if not os.path.isdir(vine_logs_dir):
+            continue
+        previous = load_fingerprint(vine_logs_dir) or {}
+        logs = fingerprint_logs(vine_logs_dir, previous.get('logs', {}))
+        fingerprint = {'logs': logs, 'scripts': scripts, 'options': options}
+        if (not args.force and previous.get('scripts') == scripts and previous.get('options') == options and
+                same_logs(logs, previous.get('logs', {})) and outputs_exist(vine_logs_dir, args.format)):
+            num_skipped += 1
+            if logs != previous['logs']:
+                # refresh the mtimes so that the logs are not hashed again next time
+                save_fingerprint(vine_logs_dir, fingerprint)
+            continue
+        run_dirs_to_generate.append(run_dir)
+        fingerprints[run_dir] = fingerprint
+
+    # the cores are shared between the runs processed at once, so that the pools of the stages do not multiply them
+    num_processes = max(min(args.jobs, len(run_dirs_to_generate)), 1)
+    cores_per_run = max(1, cpu_count() // num_processes)
+    jobs = [(run_dir, stage_commands(run_dir, args, cores_per_run)) for run_dir in run_dirs_to_generate]
+
+    print(f"{len(jobs)} of {len(jobs) + num_skipped} runs need to be generated")
+
+    stage_times_by_run, failed_runs = {}, {}
+    if jobs:
+        with Pool(num_processes) as pool:
+            for run_dir, stage_times, error in pool.imap_unordered(process_run, jobs):
+                stage_times_by_run[run_dir] = stage_times
+                if error:
+                    failed_runs[run_dir] = error
+                    print(f"=== {run_dir} failed: {error}")
+                    continue
+                # the fingerprint is only written once every stage succeeded
+                save_fingerprint(os.path.join(run_dir, 'vine-logs'), fingerprints[run_dir])
+                print(f"=== {run_dir} done in {sum(stage_times.values()):.2f}s")
+
+    print_summary(stage_times_by_run, num_skipped, time.time() - wall_time_start)
+
+    if failed_runs:
+        print(f"{len(failed_runs)} runs failed: {', '.join(sorted(failed_runs))}")
+        sys.exit(1)
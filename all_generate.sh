@@ -1,6 +1,2 @@
-find "./logs" -mindepth 1 -maxdepth 1 -type d |
-while IFS= read -r subdir; do
-    echo "=== processing $subdir..."
-    python generate_d3_input.py $subdir
-    python graph.py $subdir
-done
\ No newline at end of file
+# runs whose logs and scripts did not change since the last generation are skipped, see all_generate.py
+python all_generate.py "$@"
@@ -5,6 +5,12 @@ import ast
 import pandas as pd
 import sys
 import subprocess
+import json
+import hashlib
+import numpy as np
+import threading
+import zlib
+from collections import OrderedDict
 
 def safe_literal_eval(val):
     try:
@@ -12,6 +18,284 @@ def safe_literal_eval(val):
     except (ValueError, SyntaxError):
         return []
 
+def arrow_table_to_df(table):
+    import pyarrow as pa
+    df = table.to_pandas()
+    # list columns come as numpy arrays from to_pandas, convert them to python lists
+    for name, column in zip(table.column_names, table.columns):
+        if pa.types.is_list(column.type):
+            df[name] = column.to_pylist()
+    return df
+
+def find_table(log_name, csv_filename):
+    # the tables can also be generated in a columnar format, use the most recent one that exists
+    base = os.path.join(LOGS_DIR, log_name, 'vine-logs', os.path.splitext(csv_filename)[0])
+    paths = [f"{base}.{table_format}" for table_format in TABLE_FORMATS if os.path.exists(f"{base}.{table_format}")]
+    if not paths:
+        raise FileNotFoundError(f"{csv_filename} not found in {log_name}")
+    return max(paths, key=os.path.getmtime)
+
+def match_csv_dtypes(df, list_columns):
+    # a columnar table is served with the dtypes its csv would be read with, so that the responses do not depend on
+    # the format: numeric strings become numbers, lists outside of list_columns become their python repr and the
+    # nested lists, which are stored as their repr, are parsed
+    for column in df.columns:
+        values = df[column]
+        if values.dtype != object:
+            continue
+        sample = next((value for value in values if value is not None), None)
+        if isinstance(sample, str):
+            if column in list_columns:
+                df[column] = values.apply(safe_literal_eval)
+                continue
+            try:
+                df[column] = pd.to_numeric(values)
+            except (ValueError, TypeError):
+                pass
+        elif isinstance(sample, list) and column not in list_columns:
+            df[column] = values.map(str)
+    return df
+
+def read_table(path, list_columns=[]):
+    # pyarrow is only needed for the columnar formats
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return match_csv_dtypes(arrow_table_to_df(pq.read_table(path)), list_columns)
+    if path.endswith('.feather'):
+        import pyarrow.feather as feather
+        return match_csv_dtypes(arrow_table_to_df(feather.read_table(path)), list_columns)
+    # list columns are stored as python reprs in csv
+    df = pd.read_csv(path)
+    for col in list_columns:
+        if col in df.columns:
+            df[col] = df[col].apply(safe_literal_eval)
+    return df
+
+class DatasetCache:
+    # parsed tables keyed by (log_name, csv_filename, mtime), evicted in LRU order when over the memory budget
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.datasets = OrderedDict()
+        # id of a cached DataFrame -> its key, to find the sort orders of a table handed out by get()
+        self.dataset_keys = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, log_name, csv_filename):
+        path = find_table(log_name, csv_filename)
+        key = (log_name, csv_filename, os.stat(path).st_mtime_ns)
+        with self.lock:
+            if key in self.datasets:
+                self.hits += 1
+                self.datasets.move_to_end(key)
+                return self.datasets[key]['df']
+            self.misses += 1
+
+        df = read_table(path, LIST_COLUMNS)
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+
+        with self.lock:
+            # drop the outdated versions of this table
+            for outdated_key in [k for k in self.datasets if k[:2] == key[:2]]:
+                self._remove(outdated_key)
+            self.datasets[key] = {'df': df, 'nbytes': nbytes, 'sort_orders': {}, 'relative_times': {}, 'downsampled': {}}
+            self.dataset_keys[id(df)] = key
+            self.total_bytes += nbytes
+            self._evict()
+        return df
+
+    def sort_order(self, df, column, ascending):
+        # positions of the rows of df sorted by column, computed once per table and direction
+        # a stable sort with missing values last, the same order as sort_values
+        return self._derived(df, 'sort_orders', (column, ascending),
+                             lambda: df[column].reset_index(drop=True).sort_values(ascending=ascending, kind='stable').index.to_numpy())
+
+    def relative_times(self, df, columns, time_start):
+        # the time columns of df relative to time_start, computed once per table as one float64 block
+        return self._derived(df, 'relative_times', (tuple(columns), time_start),
+                             lambda: np.round(df[columns].to_numpy(dtype=np.float64, na_value=np.nan) - time_start, 2))
+
+    def downsampled(self, df, series_key, compute):
+        # a downsampled series of df, cached per zoom level
+        return self._derived(df, 'downsampled', series_key, compute)
+
+    def _derived(self, df, kind, derived_key, compute):
+        # arrays derived from a cached table live with it and count toward the memory budget
+        with self.lock:
+            key = self.dataset_keys.get(id(df))
+            if key is not None and derived_key in self.datasets[key][kind]:
+                return self.datasets[key][kind][derived_key]
+
+        derived = compute()
+
+        with self.lock:
+            if key in self.datasets:
+                self.datasets[key][kind][derived_key] = derived
+                self.datasets[key]['nbytes'] += derived.nbytes
+                self.total_bytes += derived.nbytes
+                self._evict()
+        return derived
+
+    def _remove(self, key):
+        dataset = self.datasets.pop(key)
+        del self.dataset_keys[id(dataset['df'])]
+        self.total_bytes -= dataset['nbytes']
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.datasets) > 1:
+            self._remove(next(iter(self.datasets)))
+            self.evictions += 1
+
+    def metrics(self):
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'datasets': len(self.datasets),
+                'sort_orders': sum(len(dataset['sort_orders']) for dataset in self.datasets.values()),
+                'relative_times': sum(len(dataset['relative_times']) for dataset in self.datasets.values()),
+                'downsampled': sum(len(dataset['downsampled']) for dataset in self.datasets.values()),
+                'memory(MB)': round(self.total_bytes / 2**20, 2),
+                'max_memory(MB)': round(self.max_bytes / 2**20, 2),
+            }
+
+def filename_hash(filename):
+    # the same stable 64-bit hash as generate_d3_input.py
+    return int.from_bytes(hashlib.blake2b(filename.encode(), digest_size=8).digest(), 'little')
+
+def filename_trigrams(filename):
+    # each trigram is packed into one integer with 21 bits per code point, as in generate_d3_input.py
+    codes = [ord(c) for c in filename]
+    return {(codes[i] << 42) | (codes[i + 1] << 21) | codes[i + 2] for i in range(len(codes) - 2)}
+
+def load_filename_index(log_name):
+    # the index written by generate_d3_input.py, memory-mapped and reloaded when it is regenerated
+    index_dir = os.path.join(LOGS_DIR, log_name, 'vine-logs', 'filename_index')
+    meta_path = os.path.join(index_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    mtime = os.stat(meta_path).st_mtime_ns
+    if log_name not in filename_indexes or filename_indexes[log_name][0] != mtime:
+        with open(meta_path, 'r') as f:
+            filename_index = json.load(f)
+        for name in FILENAME_INDEX_ARRAYS:
+            filename_index[name] = np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode='r')
+        filename_indexes[log_name] = (mtime, filename_index)
+    return filename_indexes[log_name][1]
+
+def lookup_postings(keys, offsets, values, key):
+    i = np.searchsorted(keys, key)
+    if i == len(keys) or keys[i] != key:
+        return values[:0]
+    return values[offsets[i]:offsets[i + 1]]
+
+def find_tasks_by_filename(task_done_df, filename_index, filename):
+    task_ids = lookup_postings(filename_index['task_file_hashes'], filename_index['task_file_offsets'],
+                               filename_index['task_ids'], filename_hash(filename))
+    # task_id -> rows with a binary search over the cached task_id order
+    order = dataset_cache.sort_order(task_done_df, 'task_id', True)
+    lefts = np.searchsorted(task_done_df['task_id'].to_numpy(), task_ids, side='left', sorter=order)
+    rights = np.searchsorted(task_done_df['task_id'].to_numpy(), task_ids, side='right', sorter=order)
+    rows = np.sort(np.concatenate([order[left:right] for left, right in zip(lefts, rights)] + [order[:0]]))
+    matched_df = task_done_df.iloc[rows]
+    # guard against hash collisions
+    return matched_df[matched_df['input_files'].apply(lambda x: filename in x) | matched_df['output_files'].apply(lambda x: filename in x)]
+
+def find_files_by_substring(file_info_df, filename_index, search_value):
+    # files containing every trigram of the search value, None if the index can not answer the search
+    trigrams = filename_trigrams(search_value)
+    if not trigrams or filename_index['num_files'] != len(file_info_df):
+        return None
+    postings = [lookup_postings(filename_index['file_trigrams'], filename_index['file_trigram_offsets'],
+                                filename_index['file_rows'], trigram) for trigram in trigrams]
+    postings.sort(key=len)
+    rows = postings[0]
+    for posting in postings[1:]:
+        rows = np.intersect1d(rows, posting, assume_unique=True)
+    matched_df = file_info_df.iloc[rows]
+    return matched_df[matched_df['filename'].apply(lambda x: search_value in x)]
+
+def to_relative_times(page_df, full_df, columns, time_start):
+    # the cached tables keep their default index, so the index of a page holds its row positions
+    page_df[columns] = dataset_cache.relative_times(full_df, columns, time_start)[page_df.index.to_numpy()]
+
+def downsample_min_max(times, values, t0, t1, width):
+    # the first, last, minimum and maximum point of each of the width buckets between t0 and t1,
+    # and the last point before t0 so that a step line starts at the right value
+    lo = max(np.searchsorted(times, t0, side='left') - 1, 0)
+    hi = np.searchsorted(times, t1, side='right')
+    times, values = times[lo:hi], values[lo:hi]
+    if len(times) <= 4 * width or t1 <= t0:
+        return np.vstack([times, values])
+    buckets = np.clip(((times - t0) / (t1 - t0) * width).astype(np.int64), 0, width - 1)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    # times are sorted, so each bucket is a contiguous range, also after sorting by (bucket, value)
+    by_value = np.lexsort((values, buckets))
+    keep = np.unique(np.concatenate([starts, ends, by_value[starts], by_value[ends]]))
+    return np.vstack([times[keep], values[keep]])
+
+def take_page(df, start, length, order=None):
+    # with a sort order only the rows on the page are gathered
+    if order is None:
+        return df.iloc[start:start + length]
+    return df.iloc[order[start:start + length]]
+
+def encode_table_json(df, orient):
+    # the JSON body piece by piece, only CSV_DATA_CHUNK_ROWS rows are converted at a time
+    chunk_starts = range(0, len(df), CSV_DATA_CHUNK_ROWS)
+    if orient == 'columns':
+        yield '{"columns": ' + json.dumps([str(column) for column in df.columns]) + ', "data": {'
+        for i, column in enumerate(df.columns):
+            yield (', ' if i else '') + json.dumps(str(column)) + ': ['
+            for chunk_start in chunk_starts:
+                values = df[column].iloc[chunk_start:chunk_start + CSV_DATA_CHUNK_ROWS].fillna('N/A').tolist()
+                yield (', ' if chunk_start else '') + json.dumps(values)[1:-1]
+            yield ']'
+        yield '}}'
+    else:
+        yield '['
+        for chunk_start in chunk_starts:
+            records = df.iloc[chunk_start:chunk_start + CSV_DATA_CHUNK_ROWS].fillna('N/A').to_dict(orient='records')
+            yield (', ' if chunk_start else '') + json.dumps(records)[1:-1]
+        yield ']'
+
+def choose_content_encoding(accept_encodings):
+    # brotli is optional, gzip is always available through zlib
+    if 'br' in accept_encodings:
+        try:
+            import brotli
+            return 'br'
+        except ImportError:
+            pass
+    if 'gzip' in accept_encodings:
+        return 'gzip'
+    return None
+
+def compress_stream(pieces, content_encoding):
+    if content_encoding == 'br':
+        import brotli
+        compressor = brotli.Compressor(quality=5)
+        for piece in pieces:
+            data = compressor.process(piece.encode())
+            if data:
+                yield data
+        yield compressor.finish()
+    elif content_encoding == 'gzip':
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for piece in pieces:
+            data = compressor.compress(piece.encode())
+            if data:
+                yield data
+        yield compressor.flush()
+    else:
+        for piece in pieces:
+            yield piece.encode()
+
 def kill_process_on_port(port):
     try:
         # Find the process running on the specified port
@@ -33,6 +317,33 @@ def kill_process_on_port(port):
 app = Flask(__name__)
 
 LOGS_DIR = 'logs'
+TABLE_FORMATS = ['csv', 'parquet', 'feather']
+CSV_DATA_CHUNK_ROWS = 65536
+# series name -> (table, time column, value columns), the first value column is the default
+DOWNSAMPLE_SERIES = {
+    # the per-category and per-worker columns exist when the tables were generated with --concurrency-breakdown
+    'task_concurrency': ('task_concurrency.csv', 'time', ['concurrent_tasks', 'concurrent_tasks_in_category', 'concurrent_tasks_on_worker']),
+    'worker_disk_usage': ('worker_disk_usage.csv', 'when_stage_in_or_out',
+                          ['disk_usage(MB)', 'disk_usage(%)', 'disk_usage_accumulation(MB)', 'disk_usage_accumulation(%)']),
+}
+# the column each filter of a series selects, the other columns sampled at the filtered rows would be wrong
+DOWNSAMPLE_FILTER_COLUMNS = {
+    'task_concurrency': {'worker_id': 'concurrent_tasks_on_worker', 'category': 'concurrent_tasks_in_category'},
+}
+# the samples of these series are per worker, their mix across workers has no meaningful envelope
+DOWNSAMPLE_PER_WORKER_SERIES = ['worker_disk_usage']
+MAX_DOWNSAMPLE_WIDTH = 16384
+LIST_COLUMNS = ['input_files', 'output_files', 'producers', 'consumers', 'worker_holding', 'critical_tasks']
+
+# the cached tables are shared between requests and must not be modified in place
+dataset_cache = DatasetCache(max_bytes=2048 * 2**20)
+# log_name -> (mtime, memory-mapped filename index)
+filename_indexes = {}
+TASK_DONE_TIME_COLUMNS = ['when_ready', 'time_commit_start', 'time_commit_end', 'when_running',
+                          'time_worker_start', 'time_worker_end', 'when_waiting_retrieval',
+                          'when_retrieved', 'when_done', 'when_next_ready', 'when_output_fully_lost']
+TASK_FAILED_TIME_COLUMNS = ['when_ready', 'when_running', 'when_next_ready']
+FILENAME_INDEX_ARRAYS = ['task_file_hashes', 'task_file_offsets', 'task_ids', 'file_trigrams', 'file_trigram_offsets', 'file_rows']
 
 
 @app.route('/tasks_completed')
@@ -45,33 +356,25 @@ def get_tasks():
     search_type = request.args.get('search[type]', '')
     timestamp_type = request.args.get('timestamp_type')
 
-    manager_info_df = pd.read_csv(os.path.join(LOGS_DIR, log_name, 'vine-logs', 'manager_info.csv'))
+    manager_info_df = dataset_cache.get(log_name, 'manager_info.csv')
     time_manager_start = manager_info_df['time_start'][0]
 
-    task_done_df = pd.read_csv(os.path.join(LOGS_DIR, log_name, 'vine-logs', 'task_done.csv')).fillna('N/A')
-    task_done_df['input_files'] = task_done_df['input_files'].apply(safe_literal_eval)
-    task_done_df['output_files'] = task_done_df['output_files'].apply(safe_literal_eval)
-
-    if timestamp_type == 'relative':
-        time_columns = ['when_ready', 'time_commit_start', 'time_commit_end', 'when_running',
-                        'time_worker_start', 'time_worker_end', 'when_waiting_retrieval',
-                        'when_retrieved', 'when_done', 'when_next_ready', 'when_output_fully_lost']
-        for col in time_columns:
-            try:
-                task_done_df[col] = round(task_done_df[col] - time_manager_start, 2)
-            except:
-                pass
-    task_done_df['execution_time'] = round(task_done_df['execution_time'], 4)
+    all_tasks_df = task_done_df = dataset_cache.get(log_name, 'task_done.csv')
 
     total_records = len(task_done_df)
 
+    order = None
     if search_value:
         if search_type == "task-id":
             task_done_df = task_done_df[task_done_df['task_id'] == int(search_value)]
         elif search_type == "category":
             task_done_df = task_done_df[task_done_df['category'].apply(lambda x: search_value in x)]
         elif search_type == "filename":
-            task_done_df = task_done_df[task_done_df['input_files'].apply(lambda x: search_value in x) | task_done_df['output_files'].apply(lambda x: search_value in x)]
+            filename_index = load_filename_index(log_name)
+            if filename_index is not None:
+                task_done_df = find_tasks_by_filename(task_done_df, filename_index, search_value)
+            else:
+                task_done_df = task_done_df[task_done_df['input_files'].apply(lambda x: search_value in x) | task_done_df['output_files'].apply(lambda x: search_value in x)]
         elif search_type == "task-ids":
             search_tasks = [int(task_id) for task_id in search_value.split(',')]
             task_done_df = task_done_df[task_done_df['task_id'].apply(lambda x: x in search_tasks)]
@@ -80,12 +383,14 @@ def get_tasks():
         order_column = request.args.get('order[0][column]', '0')
         order_dir = request.args.get('order[0][dir]', 'asc')
         column_name = request.args.get(f'columns[{order_column}][data]', 'task_id')
-        if order_dir == 'asc':
-            task_done_df = task_done_df.sort_values(by=column_name, ascending=True)
-        else:
-            task_done_df = task_done_df.sort_values(by=column_name, ascending=False)
-        
-    page_data = task_done_df.iloc[start:start + length].to_dict(orient='records')
+        order = dataset_cache.sort_order(task_done_df, column_name, ascending=(order_dir == 'asc'))
+
+    # only the rows on this page are converted
+    page_df = take_page(task_done_df, start, length, order).copy()
+    if timestamp_type == 'relative':
+        to_relative_times(page_df, all_tasks_df, TASK_DONE_TIME_COLUMNS, time_manager_start)
+    page_df['execution_time'] = round(page_df['execution_time'], 4)
+    page_data = page_df.fillna('N/A').to_dict(orient='records')
 
     response = {
         "draw": draw,
@@ -107,16 +412,12 @@ def get_tasks_failed():
     search_type = request.args.get('search[type]', '')
     timestamp_type = request.args.get('timestamp_type')
 
-    manager_info_df = pd.read_csv(os.path.join(LOGS_DIR, log_name, 'vine-logs', 'manager_info.csv'))
+    manager_info_df = dataset_cache.get(log_name, 'manager_info.csv')
     time_manager_start = manager_info_df['time_start'][0]
 
-    tasks_failed_df = pd.read_csv(os.path.join(LOGS_DIR, log_name, 'vine-logs', 'task_failed_on_worker.csv')).fillna('N/A')
-
-    if timestamp_type == 'relative':
-        time_columns = ['when_ready', 'when_running', 'when_next_ready']
-        for col in time_columns:
-            tasks_failed_df[col] = round(tasks_failed_df[col] - time_manager_start, 2)
+    all_tasks_df = tasks_failed_df = dataset_cache.get(log_name, 'task_failed_on_worker.csv')
 
+    order = None
     if search_value:
         if search_type == "task-id":
             tasks_failed_df = tasks_failed_df[tasks_failed_df['task_id'] == int(search_value)]
@@ -129,12 +430,13 @@ def get_tasks_failed():
         order_column = request.args.get('order[0][column]', '0')
         order_dir = request.args.get('order[0][dir]', 'asc')
         column_name = request.args.get(f'columns[{order_column}][data]', 'worker_id')
-        if order_dir == 'asc':
-            tasks_failed_df = tasks_failed_df.sort_values(by=column_name, ascending=True)
-        else:
-            tasks_failed_df = tasks_failed_df.sort_values(by=column_name, ascending=False)
-    
-    page_data = tasks_failed_df.iloc[start:start + length].to_dict(orient='records')
+        order = dataset_cache.sort_order(tasks_failed_df, column_name, ascending=(order_dir == 'asc'))
+
+    # only the rows on this page are converted
+    page_df = take_page(tasks_failed_df, start, length, order).copy()
+    if timestamp_type == 'relative':
+        to_relative_times(page_df, all_tasks_df, TASK_FAILED_TIME_COLUMNS, time_manager_start)
+    page_data = page_df.fillna('N/A').to_dict(orient='records')
 
     response = {
         "draw": draw,
@@ -154,8 +456,9 @@ def get_worker_summary():
     search_type = request.args.get('search[type]', '')
     timestamp_type = request.args.get('timestamp_type')
 
-    worker_df = pd.read_csv(os.path.join(LOGS_DIR, log_name, 'vine-logs', 'worker_summary.csv'))
+    worker_df = dataset_cache.get(log_name, 'worker_summary.csv')
 
+    order = None
     if search_value:
         pass
     else:
@@ -163,12 +466,9 @@ def get_worker_summary():
         order_column = request.args.get('order[0][column]', '0')
         order_dir = request.args.get('order[0][dir]', 'asc')
         column_name = request.args.get(f'columns[{order_column}][data]', 'worker_id')
-        if order_dir == 'asc':
-            worker_df = worker_df.sort_values(by=column_name, ascending=True)
-        else:
-            worker_df = worker_df.sort_values(by=column_name, ascending=False)
+        order = dataset_cache.sort_order(worker_df, column_name, ascending=(order_dir == 'asc'))
     
-    page_data = worker_df.iloc[start:start + length].to_dict(orient='records')
+    page_data = take_page(worker_df, start, length, order).to_dict(orient='records')
 
     response = {
         "draw": draw,
@@ -189,10 +489,10 @@ def get_dag():
     search_type = request.args.get('search[type]', '')
     timestamp_type = request.args.get('timestamp_type')
 
-    dag_df = pd.read_csv(os.path.join(LOGS_DIR, log_name, 'vine-logs', 'graph_info.csv'))
+    dag_df = dataset_cache.get(log_name, 'graph_info.csv')
     columns_to_return = ['graph_id', 'num_tasks', 'time_completion', 'num_critical_tasks', 'critical_tasks']
-    dag_df = dag_df[columns_to_return]
 
+    order = None
     if search_value:
         pass
     else:
@@ -200,12 +500,9 @@ def get_dag():
         order_column = request.args.get('order[0][column]', '0')
         order_dir = request.args.get('order[0][dir]', 'asc')
         column_name = request.args.get(f'columns[{order_column}][data]', 'graph_id')
-        if order_dir == 'asc':
-            dag_df = dag_df.sort_values(by=column_name, ascending=True)
-        else:
-            dag_df = dag_df.sort_values(by=column_name, ascending=False)
+        order = dataset_cache.sort_order(dag_df, column_name, ascending=(order_dir == 'asc'))
     
-    page_data = dag_df.iloc[start:start + length].to_dict(orient='records')
+    page_data = take_page(dag_df, start, length, order)[columns_to_return].to_dict(orient='records')
 
     response = {
         "draw": draw,
@@ -225,15 +522,18 @@ def get_file():
     search_value = request.args.get('search[value]', '')
     search_type = request.args.get('search[type]', '')
 
-    file_info_df = pd.read_csv(os.path.join(LOGS_DIR, log_name, 'vine-logs', 'file_info.csv'))
-    file_info_df['producers'] = file_info_df['producers'].apply(safe_literal_eval)
-    file_info_df['consumers'] = file_info_df['consumers'].apply(safe_literal_eval)
-    file_info_df['worker_holding'] = file_info_df['worker_holding'].apply(safe_literal_eval)
+    file_info_df = dataset_cache.get(log_name, 'file_info.csv')
 
+    order = None
     if search_type:
         if search_type == 'filename':
             search_value = search_value.strip()
-            file_info_df = file_info_df[file_info_df['filename'].apply(lambda x: search_value in x)]
+            filename_index = load_filename_index(log_name)
+            matched_df = find_files_by_substring(file_info_df, filename_index, search_value) if filename_index is not None else None
+            if matched_df is not None:
+                file_info_df = matched_df
+            else:
+                file_info_df = file_info_df[file_info_df['filename'].apply(lambda x: search_value in x)]
         elif search_type == 'has-producer':
             file_info_df = file_info_df[file_info_df['producers'].apply(lambda x: len(x) > 0)]
     else:
@@ -241,12 +541,9 @@ def get_file():
         order_column = request.args.get('order[0][column]', '0')
         order_dir = request.args.get('order[0][dir]', 'asc')
         column_name = request.args.get(f'columns[{order_column}][data]', 'filename')
-        if order_dir == 'asc':
-            file_info_df = file_info_df.sort_values(by=column_name, ascending=True)
-        else:
-            file_info_df = file_info_df.sort_values(by=column_name, ascending=False)
+        order = dataset_cache.sort_order(file_info_df, column_name, ascending=(order_dir == 'asc'))
     
-    page_data = file_info_df.iloc[start:start + length].to_dict(orient='records')
+    page_data = take_page(file_info_df, start, length, order).to_dict(orient='records')
 
     response = {
         "draw": draw,
@@ -260,15 +557,94 @@ def get_file():
 def get_csv_data():
     log_name = request.args.get('log_name')
     csv_filename = request.args.get('csv_filename', type=str)
+    # orient=columns returns {"columns": [...], "data": {column: [values]}} instead of one dict per row
+    orient = request.args.get('orient', 'records', type=str)
+    start = request.args.get('start', 0, type=int)
+    length = request.args.get('length', None, type=int)
     try:
-        df = pd.read_csv(os.path.join(LOGS_DIR, log_name, 'vine-logs', csv_filename)).fillna('N/A')
-        for col in ['input_files', 'output_files', 'producers', 'consumers', 'worker_holding', 'critical_tasks']:
-            if col in df.columns:
-                df[col] = df[col].apply(safe_literal_eval)
-        return df.to_dict(orient='records')
+        df = dataset_cache.get(log_name, csv_filename)
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
+    total_rows = len(df)
+    if start or length is not None:
+        df = df.iloc[start:None if length is None else start + length]
+
+    # the body is encoded and compressed while it is sent
+    content_encoding = choose_content_encoding(request.accept_encodings)
+    headers = {'X-Total-Rows': str(total_rows), 'Vary': 'Accept-Encoding'}
+    if content_encoding:
+        headers['Content-Encoding'] = content_encoding
+    return Response(compress_stream(encode_table_json(df, orient), content_encoding), mimetype='application/json', headers=headers)
+
+@app.route('/downsample')
+def downsample():
+    log_name = request.args.get('log_name')
+    series = request.args.get('series', type=str)
+    column = request.args.get('column', None, type=str)
+    worker_id = request.args.get('worker_id', None, type=int)
+    category = request.args.get('category', None, type=str)
+    width = min(max(request.args.get('width', 1000, type=int), 1), MAX_DOWNSAMPLE_WIDTH)
+    if series not in DOWNSAMPLE_SERIES:
+        return jsonify({'error': f"unknown series {series}"}), 400
+    csv_filename, time_column, value_columns = DOWNSAMPLE_SERIES[series]
+    if series in DOWNSAMPLE_PER_WORKER_SERIES and worker_id is None:
+        return jsonify({'error': f"{series} needs a worker_id"}), 400
+    filters = {'worker_id': worker_id, 'category': category}
+    for name, filter_column in DOWNSAMPLE_FILTER_COLUMNS.get(series, {}).items():
+        if filters[name] is not None:
+            column = column or filter_column
+            if column != filter_column:
+                return jsonify({'error': f"{name} selects {filter_column} of {series}, not {column}"}), 400
+        elif column == filter_column:
+            return jsonify({'error': f"{column} of {series} needs a {name}"}), 400
+    column = column or value_columns[0]
+    if column not in value_columns:
+        return jsonify({'error': f"unknown column {column} for {series}"}), 400
+    try:
+        df = dataset_cache.get(log_name, csv_filename)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
+    if column not in df.columns:
+        return jsonify({'error': f"{column} was not generated for {log_name}"}), 404
+    if category is not None and 'category' not in df.columns:
+        return jsonify({'error': f"{series} has no category column"}), 400
+
+    # without t0 and t1 the whole series is downsampled
+    t0 = request.args.get('t0', None, type=float)
+    t1 = request.args.get('t1', None, type=float)
+
+    def compute():
+        rows = np.ones(len(df), dtype=bool)
+        if worker_id is not None:
+            rows &= df['worker_id'].to_numpy() == worker_id
+        if category is not None:
+            rows &= df['category'].to_numpy() == category
+        times = df[time_column].to_numpy(dtype=np.float64)[rows]
+        values = df[column].to_numpy(dtype=np.float64)[rows]
+        order = np.argsort(times, kind='stable')
+        if len(times) == 0:
+            return np.vstack([times, values])
+        return downsample_min_max(times[order], values[order], times[order[0]] if t0 is None else t0,
+                                  times[order[-1]] if t1 is None else t1, width)
+
+    points = dataset_cache.downsampled(df, (series, column, worker_id, category, t0, t1, width), compute)
+    return jsonify({
+        'series': series,
+        'column': column,
+        'worker_id': worker_id,
+        'category': category,
+        't0': t0,
+        't1': t1,
+        'width': width,
+        'time': points[0].tolist(),
+        'value': points[1].tolist(),
+    })
+
+@app.route('/metrics')
+def metrics():
+    return jsonify({'dataset_cache': dataset_cache.metrics()})
+
 @app.route('/')
 def index():
     log_folders = [name for name in os.listdir(LOGS_DIR) if os.path.isdir(os.path.join(LOGS_DIR, name))]
@@ -327,8 +703,11 @@ def serve_file(filename):
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('--generate-data', default=False)
+    parser.add_argument('--cache-memory-mb', type=int, default=2048, help='Memory budget of the in-process dataset cache')
     args = parser.parse_args()
 
+    dataset_cache.max_bytes = args.cache_memory_mb * 2**20
+
     kill_process_on_port(9122)
         
     app.run(host='0.0.0.0', port=9122, debug=True)
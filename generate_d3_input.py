@@ -1,25 +1,55 @@
 import argparse
-import os
+import calendar
 import copy
+import hashlib
+import io
 import json
-import pandas as pd
-from datetime import datetime
+import os
+import pickle
 import re
-from tqdm import tqdm
-import json
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from multiprocessing import Pool, cpu_count
+
+import numpy as np
+import pandas as pd
 from bitarray import bitarray # type: ignore
 from tqdm import tqdm
-import re
-from datetime import datetime, timezone, timedelta
-import pytz
-import numpy as np
 
 
 # initialize the global variables
-task_info, task_try_count, library_info, worker_info, manager_info, file_info, category_info = {}, {}, {}, {}, {}, {}, {}
-worker_address_hash_map = {}
+task_try_count, library_info, worker_info, manager_info, file_info, category_info = {}, {}, {}, {}, {}, {}
 task_start_timestamp = 'time_worker_start'
 task_finish_timestamp = 'time_worker_end'
+# csv, parquet or feather, the columnar formats keep list columns as native lists
+output_format = 'csv'
+# with --concurrency-breakdown, task_concurrency also counts the concurrent tasks within each category and on each worker
+concurrency_breakdown = False
+# with --follow, the parser state is restored from a checkpoint and only the new lines of the logs are parsed
+follow_logs = False
+# the number of processes that scan the debug log with --parallel-debug
+num_cores = cpu_count()
+# the state the parsers carry from one incremental run to the next
+parser_state = {
+    'log_offsets': {},              # log file name -> bytes parsed
+    'last_txn_timestamp': None,
+    'putting_file': False,          # a put in progress at the end of the parsed debug log
+    'putting_filename': None,
+    'daskvine_times': {},           # task id -> [when submitted, when received] by daskvine
+    'recovery_tasks': set(),        # ids of the recovery tasks submitted by the manager
+    'unlisted_files': set(),        # files seen in the debug log before the taskgraph listed them
+}
+CHECKPOINT_FILENAME = '.generate_checkpoint.pkl'
+CHECKPOINT_GLOBALS = ['task_info', 'task_try_count', 'library_info', 'worker_info', 'manager_info', 'file_info',
+                      'category_info', 'worker_core_allocators', 'worker_addresses', 'parser_state']
+
+# logs are read in a single pass with a large buffer, the progress bar follows the byte offset
+READ_BUFFER_SIZE = 16 * 2**20
+PROGRESS_UPDATE_LINES = 8192
+# the debug log is split into chunks of about this size when scanned in parallel
+DEBUG_CHUNK_SIZE = 64 * 2**20
 
 ############################################################################################################
 # Helper functions
@@ -27,10 +57,15 @@ def datestring_to_timestamp(datestring):
     if manager_info['time_zone_offset_hours'] is None:
         print("Warning: time_zone_offset_hours is not set")
         exit(1)
-    tz_custom = timezone(timedelta(hours=manager_info['time_zone_offset_hours']))
-    datestring_custom = datetime.strptime(datestring, "%Y/%m/%d %H:%M:%S.%f").replace(tzinfo=tz_custom)
-    unix_timestamp = int(datestring_custom.timestamp())
-    return unix_timestamp
+    # the timestamp is truncated to seconds, so lines within the same second share the result
+    return datestring_seconds_to_timestamp(datestring[:19], manager_info['time_zone_offset_hours'])
+
+@lru_cache(maxsize=65536)
+def datestring_seconds_to_timestamp(datestring_seconds, time_zone_offset_hours):
+    # fixed format "%Y/%m/%d %H:%M:%S", parsed by position instead of datetime.strptime
+    utc_seconds = calendar.timegm((int(datestring_seconds[0:4]), int(datestring_seconds[5:7]), int(datestring_seconds[8:10]),
+                                   int(datestring_seconds[11:13]), int(datestring_seconds[14:16]), int(datestring_seconds[17:19])))
+    return utc_seconds - int(time_zone_offset_hours * 3600)
 
 def timestamp_to_datestring(unix_timestamp):
     if manager_info['time_zone_offset_hours'] is None:
@@ -41,30 +76,444 @@ def timestamp_to_datestring(unix_timestamp):
     return datestring_custom
 
 def set_time_zone(datestring):
-    mgr_start_datesting = datetime.strptime(datestring, "%Y/%m/%d %H:%M:%S.%f").strftime("%Y-%m-%d %H:%M:%S")
-    formatted_timestamp = int(manager_info['time_start'])
-    utc_datestring = datetime.fromtimestamp(formatted_timestamp, timezone.utc)
-    for tz in pytz.all_timezones:
-        tz_datestring = utc_datestring.replace(tzinfo=pytz.utc).astimezone(pytz.timezone(tz)).strftime('%Y-%m-%d %H:%M:%S')
-        if mgr_start_datesting == tz_datestring:
-            manager_info['time_zone_offset_hours'] = int(pytz.timezone(tz).utcoffset(datetime.now()).total_seconds() / 3600)
-            
-def get_worker_ip_port_by_hash(worker_address_hash_map, worker_hash):
-    # worker_address_hash_map: {(ip, port): hash}
-    workers_by_ip_port = []
-    for k, v in worker_address_hash_map.items():
-        if v == worker_hash:
-            workers_by_ip_port.append(k[0] + ":" + k[1])
-    return workers_by_ip_port
-
-def get_worker_hash(worker_ip_port_string):
-    content = re.search(r'\((.*?)\)', worker_ip_port_string).group(1)
-    worker_ip, worker_port = content.split(':')
-    return worker_address_hash_map[(worker_ip, worker_port)]
+    # the debug log is in local time while the manager start time in the transactions is a unix timestamp,
+    # their difference rounded to a quarter of an hour is the time zone offset
+    local_seconds = calendar.timegm(datetime.strptime(datestring, "%Y/%m/%d %H:%M:%S.%f").timetuple())
+    offset_seconds = round((local_seconds - int(manager_info['time_start'])) / 900) * 900
+    if offset_seconds % 3600 == 0:
+        manager_info['time_zone_offset_hours'] = offset_seconds // 3600
+    else:
+        manager_info['time_zone_offset_hours'] = offset_seconds / 3600
+
+def read_log_lines(log_file, desc):
+    # start after the lines parsed by a previous run, the offset of the last line read is kept in parser_state
+    log_name = os.path.basename(log_file)
+    start = parser_state['log_offsets'].get(log_name, 0)
+    with open(log_file, 'rb', buffering=READ_BUFFER_SIZE) as file:
+        total_bytes = os.fstat(file.fileno()).st_size
+        file.seek(start)
+        pbar = tqdm(total=total_bytes - start, desc=desc, unit='B', unit_scale=True)
+        offset = start
+        line_id = 0
+        for line in file:
+            # a live log may end with a line that is still being written, leave it to the next run
+            if follow_logs and not line.endswith(b'\n'):
+                break
+            offset += len(line)
+            line_id += 1
+            if line_id % PROGRESS_UPDATE_LINES == 0:
+                pbar.update(offset - start - pbar.n)
+            yield line.decode('utf-8', errors='replace')
+        parser_state['log_offsets'][log_name] = offset
+        pbar.update(offset - start - pbar.n)
+        pbar.close()
 
-def update_file_size(filename, size_in_mb):
+def complete_lines_end(log_file):
+    # the offset just after the last newline of a file
+    with open(log_file, 'rb') as file:
+        end = file.seek(0, os.SEEK_END)
+        while end > 0:
+            block_start = max(end - 2**16, 0)
+            file.seek(block_start)
+            newline = file.read(end - block_start).rfind(b'\n')
+            if newline >= 0:
+                return block_start + newline + 1
+            end = block_start
+    return 0
+
+def load_checkpoint():
+    checkpoint_path = os.path.join(dirname, CHECKPOINT_FILENAME)
+    if not os.path.exists(checkpoint_path):
+        return False
+    with open(checkpoint_path, 'rb') as f:
+        checkpoint = pickle.load(f)
+    # a log that is shorter than what was parsed has been restarted, parse everything again
+    for log_name, offset in checkpoint['parser_state']['log_offsets'].items():
+        log_file = os.path.join(dirname, log_name)
+        if not os.path.exists(log_file) or os.path.getsize(log_file) < offset:
+            print(f"{log_name} is shorter than the checkpoint, parsing all logs from the beginning")
+            return False
+    globals().update(checkpoint)
+    return True
+
+def save_checkpoint():
+    checkpoint = {name: globals()[name] for name in CHECKPOINT_GLOBALS}
+    if manager_info['failed'] is True:
+        # the end time was taken from the last transaction of a manager that is still running, it is set again by the next run
+        checkpoint['manager_info'] = dict(manager_info, time_end=None, failed=0, **{'lifetime(s)': None})
+    checkpoint_path = os.path.join(dirname, CHECKPOINT_FILENAME)
+    with open(checkpoint_path + '.tmp', 'wb') as f:
+        pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(checkpoint_path + '.tmp', checkpoint_path)
+
+def is_nested_list_column(values):
+    # decided by the first non-empty value, the columns hold values of one kind
+    for value in values:
+        if not isinstance(value, list):
+            return False
+        if value:
+            return isinstance(value[0], list)
+    return False
+
+def write_table(df, csv_filename, index=False):
+    if index:
+        df = df.reset_index()
+    if output_format == 'csv':
+        df.to_csv(os.path.join(dirname, csv_filename), index=False)
+        return
+    # arrow would turn the mixed int and float items of nested lists into floats, they are stored as their python repr
+    # as in csv
+    nested_list_columns = [column for column in df.columns if df[column].dtype == object and is_nested_list_column(df[column])]
+    if nested_list_columns:
+        df = df.assign(**{column: df[column].map(str) for column in nested_list_columns})
+    filename = os.path.splitext(csv_filename)[0] + '.' + output_format
+    if output_format == 'parquet':
+        df.to_parquet(os.path.join(dirname, filename), index=False)
+    elif output_format == 'feather':
+        df.reset_index(drop=True).to_feather(os.path.join(dirname, filename))
+
+def filename_hash(filename):
+    # a stable 64-bit hash, python's hash() of a str changes between processes
+    return int.from_bytes(hashlib.blake2b(filename.encode(), digest_size=8).digest(), 'little')
+
+def filename_trigrams(filename):
+    # each trigram is packed into one integer with 21 bits per code point
+    codes = [ord(c) for c in filename]
+    return {(codes[i] << 42) | (codes[i + 1] << 21) | codes[i + 2] for i in range(len(codes) - 2)}
+
+def build_postings(keys, values):
+    # group values by key: sorted unique keys, offsets into the values of each key
+    keys = np.array(keys, dtype=np.uint64)
+    values = np.array(values, dtype=np.int64)
+    order = np.argsort(keys, kind='stable')
+    keys, values = keys[order], values[order]
+    unique_keys, starts = np.unique(keys, return_index=True)
+    offsets = np.append(starts, len(keys)).astype(np.int64)
+    return unique_keys, offsets, values
+
+# the columns of a task try in output order, with how TaskStore keeps them
+#   int, float, bool: a numpy column, float columns use nan for a missing value
+#   number: a float64 column that is written as int64 if every value is a whole number
+#   string: codes into a per-column table of distinct strings, -1 for None
+#   cores, files: lists kept offset-encoded outside the columns
+TASK_COLUMNS = [
+    ('task_id', 'int'),
+    ('try_id', 'int'),
+    ('worker_id', 'int'),
+    ('core_id', 'cores'),
+    ('execution_time', 'float'),            # spans from time_worker_start to time_worker_end
+
+    # Timestamps throughout the task lifecycle
+    ('when_ready', 'float'),                # ready status on the manager
+    ('time_commit_start', 'float'),         # start commiting to worker
+    ('time_commit_end', 'float'),           # end commiting to worker
+    ('when_running', 'float'),              # running status on worker
+    ('time_worker_start', 'float'),         # start executing on worker
+    ('time_worker_end', 'float'),           # end executing on worker
+    ('when_waiting_retrieval', 'float'),    # waiting for retrieval status on worker
+    ('when_retrieved', 'float'),            # retrieved status on worker
+    ('when_done', 'float'),                 # done status on worker
+    ('when_next_ready', 'float'),           # only for on-worker failed tasks
+
+    ('when_output_fully_lost', 'float'),
+
+    ('worker_committed', 'string'),
+
+    ('size_input_mgr', 'float'),
+    ('size_output_mgr', 'float'),
+    ('cores_requested', 'number'),
+    ('gpus_requested', 'number'),
+    ('memory_requested(MB)', 'number'),
+    ('disk_requested(MB)', 'number'),
+    ('retrieved_status', 'string'),
+    ('done_status', 'string'),
+    ('done_code', 'string'),
+    ('category', 'string'),
+    ('category_id', 'number'),
+
+    ('input_files', 'files'),
+    ('output_files', 'files'),
+    ('size_input_files(MB)', 'int'),
+    ('size_output_files(MB)', 'int'),
+    ('critical_parent', 'number'),          # task_id of the most recent ready parent
+    ('critical_input_file', 'string'),      # input file that took the shortest time to use
+    ('critical_input_file_wait_time', 'int'),  # wait time from when the input file was ready to when it was used
+    ('is_recovery_task', 'bool'),
+
+    ('graph_id', 'int'),                    # will be set in dag part
+]
+# kind -> (dtype, value of a new row)
+TASK_COLUMN_TYPES = {
+    'int': (np.int64, 0),
+    'float': (np.float64, np.nan),
+    'number': (np.float64, np.nan),
+    'bool': (np.bool_, False),
+    'string': (np.int32, -1),
+}
+TASK_COLUMN_DEFAULTS = {'worker_id': -1, 'graph_id': -1}
+
+class TaskStore:
+    # every try of every task is one row of numpy columns that grow by doubling, looked up by (task_id, try_id)
+    def __init__(self, capacity=1024):
+        self.num_rows = 0
+        self.capacity = capacity
+        self.rows = {}
+        self.kinds = {}
+        self.columns = {}
+        self.defaults = {}
+        self.strings, self.string_codes = {}, {}
+        # a try gets all its cores at once, they are core_ids[core_start:core_start + core_count]
+        self.core_ids = array('i')
+        # files are interned, the file lists are (task_id, file) pairs that are offset-encoded when read,
+        # the files of a task belong to its latest try
+        self.last_rows = {}
+        self.file_names, self.file_codes = [], {}
+        self.file_pairs, self.file_index = {}, {}
+        for name, kind in TASK_COLUMNS:
+            self.add_column(name, kind)
+        for name in ['core_start', 'core_count']:
+            self.columns[name] = np.zeros(capacity, dtype=np.int64)
+            self.defaults[name] = 0
+
+    def add_column(self, name, kind):
+        self.kinds[name] = kind
+        if kind == 'files':
+            self.file_pairs[name] = (array('q'), array('i'))
+        elif kind == 'string':
+            self.strings[name], self.string_codes[name] = [], {}
+        if kind in TASK_COLUMN_TYPES:
+            dtype, default = TASK_COLUMN_TYPES[kind]
+            self.defaults[name] = TASK_COLUMN_DEFAULTS.get(name, default)
+            self.columns[name] = np.full(self.capacity, self.defaults[name], dtype=dtype)
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, name):
+        # the whole column, only the first len(self) entries are rows
+        return self.columns[name]
+
+    def add(self, task_id, try_id):
+        if self.num_rows == self.capacity:
+            self.capacity *= 2
+            for name, column in self.columns.items():
+                grown = np.full(self.capacity, self.defaults[name], dtype=column.dtype)
+                grown[:len(column)] = column
+                self.columns[name] = grown
+        row = self.num_rows
+        self.num_rows += 1
+        self.rows[(task_id, try_id)] = row
+        self.last_rows[task_id] = row
+        self.columns['task_id'][row] = task_id
+        self.columns['try_id'][row] = try_id
+        return row
+
+    def row(self, task_id, try_id):
+        return self.rows[(task_id, try_id)]
+
+    def get_string(self, name, row):
+        code = self.columns[name][row]
+        return None if code < 0 else self.strings[name][code]
+
+    def set_string(self, name, row, value):
+        code = -1
+        if value is not None:
+            code = self.string_codes[name].get(value)
+            if code is None:
+                code = self.string_codes[name][value] = len(self.strings[name])
+                self.strings[name].append(value)
+        self.columns[name][row] = code
+
+    def string_values(self, name):
+        # the distinct strings of a column, without None
+        codes = np.unique(self.columns[name][:self.num_rows])
+        return [self.strings[name][code] for code in codes[codes >= 0]]
+
+    def string_column(self, name):
+        # code -1 picks the None appended to the table
+        return np.array(self.strings[name] + [None], dtype=object)[self.columns[name][:self.num_rows]]
+
+    def set_cores(self, row, cores):
+        self.columns['core_start'][row] = len(self.core_ids)
+        self.columns['core_count'][row] = len(cores)
+        self.core_ids.extend(cores)
+
+    def cores(self, row):
+        core_start = self.columns['core_start'][row]
+        return self.core_ids[core_start:core_start + self.columns['core_count'][row]].tolist()
+
+    def add_file(self, name, task_id, filename):
+        code = self.file_codes.get(filename)
+        if code is None:
+            code = self.file_codes[filename] = len(self.file_names)
+            self.file_names.append(filename)
+        task_ids, codes = self.file_pairs[name]
+        task_ids.append(task_id)
+        codes.append(code)
+        self.file_index.pop(name, None)
+
+    def filter_files(self, name, keep_file):
+        # keep_file is called once per distinct file
+        keep = np.array([keep_file(filename) for filename in self.file_names] + [False], dtype=bool)
+        task_ids, codes = self.file_pairs[name]
+        mask = keep[np.array(codes, dtype=np.int64)]
+        self.file_pairs[name] = (array('q', np.array(task_ids, dtype=np.int64)[mask].tobytes()),
+                                 array('i', np.array(codes, dtype=np.int32)[mask].tobytes()))
+        self.file_index.pop(name, None)
+
+    def file_offsets(self, name):
+        # offsets of each row into the file codes grouped by row, in the order the files were added
+        if name not in self.file_index:
+            task_ids = np.array(self.file_pairs[name][0], dtype=np.int64)
+            codes = np.array(self.file_pairs[name][1], dtype=np.int32)
+            # the files of tasks without a try yet are left out
+            unique_task_ids, task_id_ids = np.unique(task_ids, return_inverse=True)
+            task_rows = np.array([self.last_rows.get(task_id, -1) for task_id in unique_task_ids.tolist()] + [-1], dtype=np.int64)
+            rows = task_rows[task_id_ids.reshape(-1)]
+            rows, codes = rows[rows >= 0], codes[rows >= 0]
+            offsets = np.zeros(self.num_rows + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=self.num_rows), out=offsets[1:])
+            self.file_index[name] = (offsets, codes[np.argsort(rows, kind='stable')])
+        return self.file_index[name]
+
+    def files(self, name, row):
+        offsets, codes = self.file_offsets(name)
+        return [self.file_names[code] for code in codes[offsets[row]:offsets[row + 1]]]
+
+    def file_lists(self, name):
+        offsets, codes = self.file_offsets(name)
+        filenames = np.array(self.file_names + [None], dtype=object)[codes].tolist()
+        offsets = offsets.tolist()
+        return [filenames[offsets[row]:offsets[row + 1]] for row in range(self.num_rows)]
+
+    def to_dataframe(self):
+        # the numeric columns are handed to pandas without a copy
+        num_rows = self.num_rows
+        core_ids = self.core_ids.tolist()
+        data = {}
+        for name, kind in self.kinds.items():
+            if kind == 'cores':
+                core_starts, core_counts = self.columns['core_start'][:num_rows].tolist(), self.columns['core_count'][:num_rows].tolist()
+                data[name] = [core_ids[start:start + count] for start, count in zip(core_starts, core_counts)]
+            elif kind == 'files':
+                data[name] = self.file_lists(name)
+            elif kind == 'string':
+                data[name] = self.string_column(name)
+            elif kind == 'number':
+                column = self.columns[name][:num_rows]
+                data[name] = column.astype(np.int64) if np.all(np.floor(column) == column) else column
+            else:
+                data[name] = self.columns[name][:num_rows]
+        return pd.DataFrame(data, copy=False)
+
+# every try of every task, (task_id, try_id) -> row
+task_info = TaskStore()
+
+class CoreAllocator:
+    # the cores of a worker as a bitset, a set bit is a busy core, core ids start from 1
+    def __init__(self, worker_hash, cores):
+        self.worker_hash = worker_hash
+        self.coremap = bitarray(cores + 1)
+        self.coremap.setall(0)
+        # there is no core 0, keep it busy so that it is never found free
+        self.coremap[0] = 1
+        # core id -> index of its open interval in self.intervals
+        self.open_intervals = {}
+        # [core_id, task_id, try_id, when_allocated, when_released] for every core a task try was given
+        self.intervals = []
+
+    def allocate(self, num_cores, task_id, try_id, timestamp):
+        # the lowest free cores, fewer if the worker does not have enough free cores
+        cores = []
+        core = 0
+        while len(cores) < num_cores:
+            try:
+                core = self.coremap.index(0, core + 1)
+            except ValueError:
+                break
+            self.coremap[core] = 1
+            self.open_intervals[core] = len(self.intervals)
+            self.intervals.append([core, task_id, try_id, timestamp, None])
+            cores.append(core)
+        return cores
+
+    def release(self, cores, task_id, try_id, timestamp):
+        # only the cores still held by this task try are freed, a try can release its cores more than once and a
+        # core released earlier may already be held by another task
+        for core in cores:
+            interval = self.open_intervals.get(core)
+            if interval is None or self.intervals[interval][1] != task_id or self.intervals[interval][2] != try_id:
+                continue
+            del self.open_intervals[core]
+            self.coremap[core] = 0
+            self.intervals[interval][4] = timestamp
+
+# worker_hash -> CoreAllocator, created with the first resources a worker reports
+worker_core_allocators = {}
+
+class WorkerAddressRegistry:
+    # worker hash <-> (ip, port), plus the "(ip:port):" tokens of the debug log that were already resolved
+    def __init__(self):
+        self.hash_by_address = {}
+        self.addresses_by_hash = {}
+        self.hash_by_token = {}
+
+    def register(self, worker_ip, worker_port, worker_hash):
+        previous_hash = self.hash_by_address.get((worker_ip, worker_port))
+        if previous_hash == worker_hash:
+            return
+        if previous_hash is not None:
+            # the address is reused by another worker, the resolved tokens may point to the old one
+            self.addresses_by_hash[previous_hash].remove(worker_ip + ":" + worker_port)
+            self.hash_by_token.clear()
+        self.hash_by_address[(worker_ip, worker_port)] = worker_hash
+        self.addresses_by_hash.setdefault(worker_hash, []).append(worker_ip + ":" + worker_port)
+
+    def hash_by_ip_port(self, worker_ip, worker_port):
+        return self.hash_by_address[(worker_ip, worker_port)]
+
+    def hash_by_ip_port_string(self, worker_ip_port_string):
+        # only the first occurrence of a token is parsed
+        worker_hash = self.hash_by_token.get(worker_ip_port_string)
+        if worker_hash is None:
+            content = re.search(r'\((.*?)\)', worker_ip_port_string).group(1)
+            worker_ip, worker_port = content.split(':')
+            worker_hash = self.hash_by_token[worker_ip_port_string] = self.hash_by_address[(worker_ip, worker_port)]
+        return worker_hash
+
+    def ip_ports_by_hash(self, worker_hash):
+        return self.addresses_by_hash.get(worker_hash, [])
+
+worker_addresses = WorkerAddressRegistry()
+
+def new_file_info():
+    return {
+        'size(MB)': 0,
+        'producers': [],
+        'consumers': [],
+        'worker_holding': [],
+    }
+
+def get_file_info(filename):
+    if filename not in file_info:
+        # the debug log of a running manager can mention an output file before the taskgraph lists it,
+        # the taskgraph adds its producers and consumers in a later --follow run
+        if not follow_logs:
+            raise ValueError(f"file {filename} not in file_info")
+        file_info[filename] = new_file_info()
+        parser_state.setdefault('unlisted_files', set()).add(filename)
+    return file_info[filename]
+
+def list_file(filename):
+    # the files are kept in the order the taskgraph lists them, as in a single run over the whole logs
     if filename not in file_info:
-        raise ValueError(f"file {filename} not in file_info")
+        file_info[filename] = new_file_info()
+    elif filename in parser_state.get('unlisted_files', ()):
+        parser_state['unlisted_files'].discard(filename)
+        file_info[filename] = file_info.pop(filename)
+
+def update_file_size(filename, size_in_mb):
+    get_file_info(filename)
     if file_info[filename]['size(MB)'] == 0:
         file_info[filename]['size(MB)'] = size_in_mb
     else:
@@ -76,256 +525,198 @@ def update_file_size(filename, size_in_mb):
 ############################################################################################################
 # Parse functions
 def parse_txn():
-    worker_coremap = {}
-
-    total_lines = 0
-    with open(txn, 'r') as file:
-        for line in file:
-            total_lines += 1
-
-    with open(txn, 'r') as file:
-        pbar = tqdm(total=total_lines, desc="parsing transactions")
-        for line in file:
-            pbar.update(1)
-
-            if line.startswith("#"):
-                continue
+    timestamp = parser_state['last_txn_timestamp']
+    for line in read_log_lines(txn, "parsing transactions"):
+        if line.startswith("#"):
+            continue
 
-            timestamp, _, event_type, obj_id, status, *info = line.split(maxsplit=5)
+        timestamp, _, event_type, obj_id, status, *info = line.split(maxsplit=5)
 
-            try:
-                timestamp = float(timestamp) / 1e6
-            except ValueError:
-                continue
+        try:
+            timestamp = float(timestamp) / 1e6
+        except ValueError:
+            continue
 
-            info = info[0] if info else "{}"
+        info = info[0] if info else "{}"
 
-            if event_type == 'TASK':
-                task_id = int(obj_id)
-                if status == 'READY':
-                    if task_id not in task_try_count:
-                        task_try_count[task_id] = 1
-                    else:
-                        task = task_info[(task_id, task_try_count[task_id])]
-                        task['when_next_ready'] = timestamp
-                        # reset the coremap for the new try
-                        for i in task['core_id']:
-                            worker_coremap[task['worker_committed']][i] = 0
-                        worker_info[task['worker_committed']]['tasks_failed'].append(task_id)
-                        task_try_count[task_id] += 1
-                    task_category = info.split()[0]
+        if event_type == 'TASK':
+            task_id = int(obj_id)
+            if status == 'READY':
+                if task_id not in task_try_count:
+                    task_try_count[task_id] = 1
+                else:
+                    row = task_info.row(task_id, task_try_count[task_id])
+                    worker_hash = task_info.get_string('worker_committed', row)
+                    task_info['when_next_ready'][row] = timestamp
+                    # release the cores of the previous try
+                    if task_info['core_count'][row] > 0:
+                        worker_core_allocators[worker_hash].release(task_info.cores(row), task_id, task_try_count[task_id], timestamp)
+                    worker_info[worker_hash]['tasks_failed'].append(task_id)
+                    task_try_count[task_id] += 1
+                task_category = info.split()[0]
+                try_id = task_try_count[task_id]
+                resources_requested = json.loads(info.split(' ', 3)[-1])
+                row = task_info.add(task_id, try_id)
+                task_info['when_ready'][row] = timestamp
+                task_info['cores_requested'][row] = resources_requested.get("cores", [0, ""])[0]
+                task_info['gpus_requested'][row] = resources_requested.get("gpus", [0, ""])[0]
+                task_info['memory_requested(MB)'][row] = resources_requested.get("memory", [0, ""])[0]
+                task_info['disk_requested(MB)'][row] = resources_requested.get("disk", [0, ""])[0]
+                task_info.set_string('category', row, task_category)
+                if task_info['cores_requested'][row] == 0:
+                    task_info['cores_requested'][row] = 1
+            if status == 'RUNNING':
+                # a running task can be a library which does not have a ready status
+                resources_allocated = json.loads(info.split(' ', 3)[-1])
+                if task_id in task_try_count:
                     try_id = task_try_count[task_id]
-                    resources_requested = json.loads(info.split(' ', 3)[-1])
-                    task = {
+                    row = task_info.row(task_id, try_id)
+                    worker_hash = info.split()[0]
+                    task_info['when_running'][row] = timestamp
+                    task_info.set_string('worker_committed', row, worker_hash)
+                    task_info['time_commit_start'][row] = float(resources_allocated["time_commit_start"][0])
+                    task_info['time_commit_end'][row] = float(resources_allocated["time_commit_end"][0])
+                    task_info['size_input_mgr'][row] = float(resources_allocated["size_input_mgr"][0])
+                    cores = worker_core_allocators[worker_hash].allocate(task_info['cores_requested'][row], task_id, try_id, timestamp)
+                    task_info.set_cores(row, cores)
+                else:
+                    library = {
                         'task_id': task_id,
-                        'try_id': try_id,
+                        'when_running': timestamp,
+                        'time_commit_start': resources_allocated["time_commit_start"][0],
+                        'time_commit_end': resources_allocated["time_commit_end"][0],
+                        'when_sent': None,
+                        'when_started': None,
+                        'when_retrieved': None,
+                        'worker_committed': info.split(' ', 3)[0],
                         'worker_id': -1,
-                        'core_id': [],
-                        'execution_time': None,           # spans from time_worker_start to time_worker_end
-
-                        # Timestamps throughout the task lifecycle
-                        'when_ready': timestamp,          # ready status on the manager
-                        'time_commit_start': None,              # start commiting to worker
-                        'time_commit_end': None,                # end commiting to worker
-                        'when_running': None,             # running status on worker
-                        'time_worker_start': None,              # start executing on worker
-                        'time_worker_end': None,                # end executing on worker
-                        'when_waiting_retrieval': None,   # waiting for retrieval status on worker
-                        'when_retrieved': None,           # retrieved status on worker
-                        'when_done': None,                # done status on worker
-                        'when_next_ready': None,          # only for on-worker failed tasks
-
-                        'when_output_fully_lost': None,
-
-                        'worker_committed': None,
-
-                        'size_input_mgr': None,
-                        'size_output_mgr': None,
-                        'cores_requested': resources_requested.get("cores", [0, ""])[0],
-                        'gpus_requested': resources_requested.get("gpus", [0, ""])[0],
-                        'memory_requested(MB)': resources_requested.get("memory", [0, ""])[0],
-                        'disk_requested(MB)': resources_requested.get("disk", [0, ""])[0],
-                        'retrieved_status': None,
-                        'done_status': None,
-                        'done_code': None,
-                        'category': task_category,
-                        'category_id': None,
-
-                        'input_files': [],
-                        'output_files': [],
-                        'size_input_files(MB)': 0,
-                        'size_output_files(MB)': 0,
-                        'critical_parent': None,                # task_id of the most recent ready parent
-                        'critical_input_file': None,            # input file that took the shortest time to use
-                        'critical_input_file_wait_time': 0,     # wait time from when the input file was ready to when it was used
-                        'is_recovery_task': False,
-
-                        'graph_id': -1,                       # will be set in dag part
-
+                        'size_input_mgr': resources_allocated["size_input_mgr"][0],
+                        'cores_requested': resources_allocated.get("cores", [0, ""])[0],
+                        'gpus_requested': resources_allocated.get("gpus", [0, ""])[0],
+                        'memory_requested(MB)': resources_allocated.get("memory", [0, ""])[0],
+                        'disk_requested(MB)': resources_allocated.get("disk", [0, ""])[0],
                     }
-                    if task['cores_requested'] == 0:
-                        task['cores_requested'] = 1
-                    task_info[(task_id, try_id)] = task
-                if status == 'RUNNING':
-                    # a running task can be a library which does not have a ready status
-                    resources_allocated = json.loads(info.split(' ', 3)[-1])
-                    if task_id in task_try_count:
-                        try_id = task_try_count[task_id]
-                        task = task_info[(task_id, try_id)]
-                        worker_hash = info.split()[0]
-                        task['when_running'] = timestamp
-                        task['worker_committed'] = worker_hash
-                        task['time_commit_start'] = float(resources_allocated["time_commit_start"][0])
-                        task['time_commit_end'] = float(resources_allocated["time_commit_end"][0])
-                        task['size_input_mgr'] = float(resources_allocated["size_input_mgr"][0])
-                        coremap = worker_coremap[worker_hash]
-                        cores_found = 0
-                        for i in range(1, len(coremap)):
-                            if coremap[i] == 0:
-                                coremap[i] = 1
-                                task['core_id'].append(i)
-                                cores_found += 1
-                                if cores_found == task['cores_requested']:
-                                    break
-                    else:
-                        library = {
-                            'task_id': task_id,
-                            'when_running': timestamp,
-                            'time_commit_start': resources_allocated["time_commit_start"][0],
-                            'time_commit_end': resources_allocated["time_commit_end"][0],
-                            'when_sent': None,
-                            'when_started': None,
-                            'when_retrieved': None,
-                            'worker_committed': info.split(' ', 3)[0],
-                            'worker_id': -1,
-                            'size_input_mgr': resources_allocated["size_input_mgr"][0],
-                            'cores_requested': resources_allocated.get("cores", [0, ""])[0],
-                            'gpus_requested': resources_allocated.get("gpus", [0, ""])[0],
-                            'memory_requested(MB)': resources_allocated.get("memory", [0, ""])[0],
-                            'disk_requested(MB)': resources_allocated.get("disk", [0, ""])[0],
+                    library_info[task_id] = library
+            if status == 'WAITING_RETRIEVAL':
+                if task_id in task_try_count:
+                    row = task_info.row(task_id, task_try_count[task_id])
+                    task_info['when_waiting_retrieval'][row] = timestamp
+                    worker_hash = task_info.get_string('worker_committed', row)
+                    worker_core_allocators[worker_hash].release(task_info.cores(row), task_id, task_try_count[task_id], timestamp)
+            if status == 'RETRIEVED':
+                try:
+                    resources_retrieved = json.loads(info.split(' ', 5)[-1])
+                except json.JSONDecodeError:
+                    resources_retrieved = {}
+                if task_id in task_try_count:
+                    row = task_info.row(task_id, task_try_count[task_id])
+                    task_info['when_retrieved'][row] = timestamp
+                    task_info.set_string('retrieved_status', row, status)
+                    task_info['time_worker_start'][row] = resources_retrieved.get("time_worker_start", [np.nan])[0]
+                    task_info['time_worker_end'][row] = resources_retrieved.get("time_worker_end", [np.nan])[0]
+                    task_info['execution_time'][row] = task_info['time_worker_end'][row] - task_info['time_worker_start'][row]
+                    task_info['size_output_mgr'][row] = resources_retrieved.get("size_output_mgr", [np.nan])[0]
+                else:
+                    library = library_info[task_id]
+                    library['when_retrieved'] = timestamp
+            if status == 'DONE':
+                done_info = info.split() if info else []
+                if task_id in task_try_count:
+                    row = task_info.row(task_id, task_try_count[task_id])
+                    worker_hash = task_info.get_string('worker_committed', row)
+                    task_info['when_done'][row] = timestamp
+                    task_info.set_string('done_status', row, done_info[0] if len(done_info) > 0 else None)
+                    task_info.set_string('done_code', row, done_info[1] if len(done_info) > 1 else None)
+                    if task_id in worker_info[worker_hash]['tasks_completed']:
+                        print(f"Warning: task {task_id} is completed twice on worker {worker_hash}")
+                    worker_info[worker_hash]['tasks_completed'].append(task_id)
+                    # update category_info
+                    task_category = task_info.get_string('category', row)
+                    execution_time = round(float(task_info[task_finish_timestamp][row] - task_info[task_start_timestamp][row]), 4)
+                    if task_category not in category_info:
+                        category_info[task_category] = {
+                            'category_id': int(len(category_info) + 1),  # starts from 1
+                            'tasks': [],
+                            'tasks_execution_time(s)': [],
                         }
-                        library_info[task_id] = library
-                if status == 'WAITING_RETRIEVAL':
-                    if task_id in task_try_count:
-                        task = task_info[(task_id, task_try_count[task_id])]
-                        task['when_waiting_retrieval'] = timestamp
-                        worker_hash = task['worker_committed']
-                        for core in task['core_id']:
-                            worker_coremap[worker_hash][core] = 0
-                if status == 'RETRIEVED':
-                    try:
-                        resources_retrieved = json.loads(info.split(' ', 5)[-1])
-                    except json.JSONDecodeError:
-                        resources_retrieved = {}
-                    if task_id in task_try_count:
-                        task = task_info[(task_id, task_try_count[task_id])]
-                        task['when_retrieved'] = timestamp
-                        task['retrieved_status'] = status
-                        task['time_worker_start'] = resources_retrieved.get("time_worker_start", [None])[0]
-                        task['time_worker_end'] = resources_retrieved.get("time_worker_end", [None])[0]
-                        task['execution_time'] = task['time_worker_end'] - task['time_worker_start']
-                        task['size_output_mgr'] = resources_retrieved.get("size_output_mgr", [None])[0]
-                    else:
-                        library = library_info[task_id]
-                        library['when_retrieved'] = timestamp
-                if status == 'DONE':
-                    done_info = info.split() if info else []
-                    if task_id in task_try_count:
-                        task = task_info[(task_id, task_try_count[task_id])]
-                        worker_hash = task['worker_committed']
-                        task['when_done'] = timestamp
-                        task['done_status'] = done_info[0] if len(done_info) > 0 else None
-                        task['done_code'] = done_info[1] if len(done_info) > 1 else None
-                        if task_id in worker_info[worker_hash]['tasks_completed']:
-                            print(f"Warning: task {task_id} is completed twice on worker {worker_hash}")
-                        worker_info[worker_hash]['tasks_completed'].append(task_id)
-                        # update category_info
-                        task_category = task['category']
-                        execution_time = round(task[task_finish_timestamp] - task[task_start_timestamp], 4)
-                        if task_category not in category_info:
-                            category_info[task_category] = {
-                                'category_id': int(len(category_info) + 1),  # starts from 1
-                                'tasks': [],
-                                'tasks_execution_time(s)': [],
-                            }
-                        category_info[task_category]['tasks'].append(task_id)
-                        category_info[task_category]['tasks_execution_time(s)'].append(execution_time)
-                        task['category_id'] = category_info[task_category]['category_id']
-            if event_type == 'WORKER':
-                if not obj_id.startswith('worker'):
+                    category_info[task_category]['tasks'].append(task_id)
+                    category_info[task_category]['tasks_execution_time(s)'].append(execution_time)
+                    task_info['category_id'][row] = category_info[task_category]['category_id']
+        if event_type == 'WORKER':
+            if not obj_id.startswith('worker'):
+                continue
+            if status == 'CONNECTION':
+                if obj_id not in worker_info:
+                    worker_info[obj_id] = {
+                        'time_connected': [timestamp],
+                        'time_disconnected': [],
+                        'worker_id': -1,
+                        'worker_machine_name': None,
+                        'worker_ip': None,
+                        'worker_port': None,
+                        'tasks_completed': [],
+                        'tasks_failed': [],
+                        'num_tasks_completed': 0,
+                        'num_tasks_failed': 0,
+                        'cores': None,
+                        'memory(MB)': None,
+                        'disk(MB)': None,
+                        'disk_update': {},
+                    }
+                else:
+                    worker_info[obj_id]['time_connected'].append(timestamp)
+            elif status == 'DISCONNECTION':
+                worker_info[obj_id]['time_disconnected'].append(timestamp)
+            elif status == 'RESOURCES':
+                # only parse the first resources reported
+                if worker_info[obj_id]['cores'] is not None:
                     continue
-                if status == 'CONNECTION':
-                    if obj_id not in worker_info:
-                        worker_info[obj_id] = {
-                            'time_connected': [timestamp],
-                            'time_disconnected': [],
-                            'worker_id': -1,
-                            'worker_machine_name': None,
-                            'worker_ip': None,
-                            'worker_port': None,
-                            'tasks_completed': [],
-                            'tasks_failed': [],
-                            'num_tasks_completed': 0,
-                            'num_tasks_failed': 0,
-                            'cores': None,
-                            'memory(MB)': None,
-                            'disk(MB)': None,
-                            'disk_update': {},
-                        }
-                    else:
-                        worker_info[obj_id]['time_connected'].append(timestamp)
-                elif status == 'DISCONNECTION':
-                    worker_info[obj_id]['time_disconnected'].append(timestamp)
-                elif status == 'RESOURCES':
-                    # only parse the first resources reported
-                    if worker_info[obj_id]['cores'] is not None:
-                        continue
-                    resources = json.loads(info)
-                    cores, memory, disk = resources.get("cores", [0, ""])[0], resources.get("memory", [0, ""])[0], resources.get("disk", [0, ""])[0]
-                    worker_info[obj_id]['cores'] = cores
-                    worker_info[obj_id]['memory(MB)'] = memory
-                    worker_info[obj_id]['disk(MB)'] = disk
-                    # for calculating task core_id
-                    worker_coremap[obj_id] = bitarray(cores + 1)
-                    worker_coremap[obj_id].setall(0)
-                elif status == 'TRANSFER' or status == 'CACHE_UPDATE':
-                    if status == 'TRANSFER':
-                        # don't consider transfer as of now
-                        pass
-                    elif status == 'CACHE_UPDATE':
-                        # will handle in debug parsing
-                        pass
-
-            if event_type == 'LIBRARY':
-                if status == 'SENT':
-                    for library in library_info.values():
-                        if library['task_id'] == obj_id:
-                            library['when_sent'] = timestamp
-                if status == 'STARTED':
-                    for library in library_info.values():
-                        if library['task_id'] == obj_id:
-                            library['when_started'] = timestamp
-            if event_type == 'MANAGER':
-                if status == 'START':
-                    manager_info['time_start'] = timestamp
-                    manager_info['time_end'] = None
-                    manager_info['lifetime(s)'] = None
-                    manager_info['time_start_human'] = None
-                    manager_info['time_end_human'] = None
-                    manager_info['tasks_submitted'] = 0
-                    manager_info['tasks_done'] = 0
-                    manager_info['tasks_failed_on_manager'] = 0
-                    manager_info['tasks_failed_on_worker'] = 0
-                    manager_info['max_task_try_count'] = 0
-                    manager_info['total_workers'] = 0
-                    manager_info['max_concurrent_workers'] = 0
-                    manager_info['failed'] = 0
-                    manager_info['time_zone_offset_hours'] = None
-
-                if status == 'END':
-                    manager_info['time_end'] = timestamp
-                    manager_info['lifetime(s)'] = round(manager_info['time_end'] - manager_info['time_start'], 2)
-        pbar.close()
+                resources = json.loads(info)
+                cores, memory, disk = resources.get("cores", [0, ""])[0], resources.get("memory", [0, ""])[0], resources.get("disk", [0, ""])[0]
+                worker_info[obj_id]['cores'] = cores
+                worker_info[obj_id]['memory(MB)'] = memory
+                worker_info[obj_id]['disk(MB)'] = disk
+                # for calculating task core_id
+                worker_core_allocators[obj_id] = CoreAllocator(obj_id, cores)
+            elif status == 'TRANSFER' or status == 'CACHE_UPDATE':
+                if status == 'TRANSFER':
+                    # don't consider transfer as of now
+                    pass
+                elif status == 'CACHE_UPDATE':
+                    # will handle in debug parsing
+                    pass
+
+        if event_type == 'LIBRARY':
+            # library instances are keyed by their task_id
+            library = library_info.get(int(obj_id))
+            if library is None:
+                continue
+            if status == 'SENT':
+                library['when_sent'] = timestamp
+            if status == 'STARTED':
+                library['when_started'] = timestamp
+        if event_type == 'MANAGER':
+            if status == 'START':
+                manager_info['time_start'] = timestamp
+                manager_info['time_end'] = None
+                manager_info['lifetime(s)'] = None
+                manager_info['time_start_human'] = None
+                manager_info['time_end_human'] = None
+                manager_info['tasks_submitted'] = 0
+                manager_info['tasks_done'] = 0
+                manager_info['tasks_failed_on_manager'] = 0
+                manager_info['tasks_failed_on_worker'] = 0
+                manager_info['max_task_try_count'] = 0
+                manager_info['total_workers'] = 0
+                manager_info['max_concurrent_workers'] = 0
+                manager_info['failed'] = 0
+                manager_info['time_zone_offset_hours'] = None
+
+            if status == 'END':
+                manager_info['time_end'] = timestamp
+                manager_info['lifetime(s)'] = round(manager_info['time_end'] - manager_info['time_start'], 2)
+
+    parser_state['last_txn_timestamp'] = timestamp
 
     if manager_info['time_end'] is None:
         # if the manager did not end, set the end time to the last txn timestamp
@@ -335,264 +726,384 @@ def parse_txn():
 
 
 def parse_taskgraph():
-    total_lines = 0
-    with open(taskgraph, 'r') as file:
-        for line in file:
-            total_lines += 1
+    for line in read_log_lines(taskgraph, "parsing taskgraph"):
+        if '->' not in line:
+            continue
+        try:
+            left, right = line.split(' -> ')
+            left = left.strip().strip('"')
+            right = right.strip()[:-1].strip('"')
+        except ValueError:
+            print(f"Warning: Unexpected format: {line}")
+            continue
 
-    with open(taskgraph, 'r') as file:
-        pbar = tqdm(total=total_lines, desc="parsing taskgraph")
-        line_id = 0
-        for line in file:
-            line_id += 1
-            pbar.update(1)
-            if '->' not in line:
-                continue
-            try:
-                left, right = line.split(' -> ')
-                left = left.strip().strip('"')
-                right = right.strip()[:-1].strip('"')
-            except ValueError:
+        try:
+            # task -> file
+            if left.startswith('task'):
+                filename = right.split('-', 1)[1]
+                task_id = int(left.split('-')[1])
+                task_info.add_file('output_files', task_id, filename)
+                list_file(filename)
+                file_info[filename]['producers'].append(task_id)
+            # file -> task
+            elif right.startswith('task'):
+                filename = left.split('-', 1)[1]
+                task_id = int(right.split('-')[1])
+                task_info.add_file('input_files', task_id, filename)
+                list_file(filename)
+                file_info[filename]['consumers'].append(task_id)
+        except IndexError:
                 print(f"Warning: Unexpected format: {line}")
                 continue
 
-            try:
-                # task -> file
-                if left.startswith('task'):
-                    filename = right.split('-', 1)[1]
-                    task_id = int(left.split('-')[1])
-                    try_id = task_try_count[task_id]
-                    task_info[(task_id, try_id)]['output_files'].append(filename)
-                    if filename not in file_info:
-                        file_info[filename] = {
-                            'size(MB)': 0,
-                            'producers': [],
-                            'consumers': [],
-                            'worker_holding': [],
-                        }
-                    file_info[filename]['producers'].append(task_id)
-                # file -> task
-                elif right.startswith('task'):
-                    filename = left.split('-', 1)[1]
-                    task_id = int(right.split('-')[1])
-                    try_id = task_try_count[task_id]
-                    task_info[(task_id, try_id)]['input_files'].append(filename)
-                    if filename not in file_info:
-                        file_info[filename] = {
-                            'size(MB)': 0,
-                            'producers': [],
-                            'consumers': [],
-                            'worker_holding': [],
-                        }
-                    file_info[filename]['consumers'].append(task_id)
-            except IndexError:
-                    print(f"Warning: Unexpected format: {line}")
-                    continue
-        pbar.close()
-
-        # we only consider files produced by another task as input files
-        for task in task_info.values():
-            cleaned_input_files = []
-            for input_file in task['input_files']:
-                if file_info[input_file]['producers']:
-                    cleaned_input_files.append(input_file)
-            task['input_files'] = cleaned_input_files
-
-
-def parse_debug():
-    global worker_info
-    total_lines = 0
-    with open(debug, 'r') as file:
-        for line in file:
-            total_lines += 1
-
-    putting_file = False
-    putting_filename = None
-
-    with open(debug, 'r') as file:
-        pbar = tqdm(total=total_lines, desc="parsing debug")
-        for line in file:
-            pbar.update(1)
-            parts = line.strip().split(" ")
-
-            if "manager" in parts and "start" in parts:
-                datestring = parts[0] + " " + parts[1]
-                set_time_zone(datestring)
-
-            if "info" in parts and "worker-id" in parts:
-                worker_id_id = parts.index("worker-id")
-                worker_hash = parts[worker_id_id + 1]
-                worker_machine_name = parts[worker_id_id - 3]
-                worker_ip, worker_port = parts[worker_id_id - 2][1:-2].split(':')
-                worker_address_hash_map[(worker_ip, worker_port)] = worker_hash
-                if worker_hash in worker_info:
-                    worker_info[worker_hash]['worker_machine_name'] = worker_machine_name
-                    worker_info[worker_hash]['worker_ip'] = worker_ip
-                    worker_info[worker_hash]['worker_port'] = worker_port
-
-            if "put" in parts:
+def finalize_taskgraph():
+    # we only consider files produced by another task as input files
+    task_info.filter_files('input_files', lambda input_file: len(file_info[input_file]['producers']) > 0)
+
+
+# Each handler takes the tokens of a debug line and the keywords found in it, and returns a record or None.
+# A handler only runs if the line contains one of its trigger keywords, so a handler can be timed on its own.
+def scan_manager_start(parts, keywords):
+    if "start" in keywords:
+        return ('manager_start', parts[0] + " " + parts[1])
+
+def scan_worker_info(parts, keywords):
+    if "info" in keywords:
+        worker_id_id = parts.index("worker-id")
+        worker_ip, worker_port = parts[worker_id_id - 2][1:-2].split(':')
+        return ('worker_id', parts[worker_id_id + 1], parts[worker_id_id - 3], worker_ip, worker_port)
+
+def scan_put(parts, keywords):
+    return ('put',)
+
+def scan_put_file(parts, keywords):
+    # only dispatched while a put may be in progress, whether it is is known when the records are applied
+    if "file" in keywords:
+        file_id = parts.index("file")
+        if 0 < file_id < len(parts) - 2 and parts[file_id - 1].endswith(':'):
+            return ('put_file', parts[0] + " " + parts[1], parts[file_id - 1], parts[file_id + 1], parts[file_id + 2])
+    if "received" in keywords:
+        received_id = parts.index("received")
+        if received_id > 0:
+            return ('put_received', parts[0] + " " + parts[1], parts[received_id - 1])
+
+def scan_puturl(parts, keywords):
+    puturl_id = parts.index("puturl") if "puturl" in keywords else parts.index("puturl_now")
+    filename = parts[puturl_id + 2]
+    size_in_mb = int(parts[puturl_id + 4]) / 2**20
+    return ('puturl', parts[0] + " " + parts[1], parts[puturl_id - 1], filename, size_in_mb)
+
+def scan_cache_update(parts, keywords):
+    # cache-update cachename, &type, &cache_level, &size, &mtime, &transfer_time, &start_time, id
+    # type: VINE_FILE=1, VINE_URL=2, VINE_TEMP=3, VINE_BUFFER=4, VINE_MINI_TASK=5
+    # cache_level: 
+    #    VINE_CACHE_LEVEL_TASK = 0,     /**< Do not cache file at worker. (default) */
+    #    VINE_CACHE_LEVEL_WORKFLOW = 1, /**< File remains in cache of worker until workflow ends. */
+    #    VINE_CACHE_LEVEL_WORKER = 2,   /**< File remains in cache of worker until worker terminates. */
+    #    VINE_CACHE_LEVEL_FOREVER = 3   /**< File remains at execution site when worker terminates. (use with caution) */
+    cache_update_id = parts.index("cache-update")
+    filename = parts[cache_update_id + 1]
+    size_in_mb = int(parts[cache_update_id + 4]) / 2**20
+    wall_time = float(parts[cache_update_id + 6]) / 1e6
+    start_time = float(parts[cache_update_id + 7]) / 1e6
+    return ('cache_update', parts[cache_update_id - 1], filename, size_in_mb, wall_time, start_time)
+
+def scan_infile(parts, keywords):
+    if "needs" not in keywords:
+        file_id = parts.index("infile") if "infile" in keywords else parts.index("outfile")
+        return ('infile', parts[file_id - 1], parts[file_id + 2])
+
+def scan_unlink(parts, keywords):
+    unlink_id = parts.index("unlink")
+    worker_ip, worker_port = parts[unlink_id - 1][1:-2].split(':')
+    return ('unlink', parts[0] + " " + parts[1], worker_ip, worker_port, parts[unlink_id + 1])
+
+def scan_recovery(parts, keywords):
+    if "recovery" in keywords and "task" in keywords:
+        return ('recovery', int(parts[parts.index("task") + 1]))
+
+# (trigger keywords, handler) in the order the handlers apply to a line
+DEBUG_LINE_HANDLERS = [
+    (frozenset(["manager"]), scan_manager_start),
+    (frozenset(["worker-id"]), scan_worker_info),
+    (frozenset(["put"]), scan_put),
+    (frozenset(["file", "received"]), scan_put_file),
+    (frozenset(["puturl", "puturl_now"]), scan_puturl),
+    (frozenset(["cache-update"]), scan_cache_update),
+    (frozenset(["infile", "outfile"]), scan_infile),
+    (frozenset(["unlink"]), scan_unlink),
+    (frozenset(["Submitted"]), scan_recovery),
+]
+# every token a handler looks at, used to classify a line with a single scan
+DEBUG_KEYWORDS = frozenset(["start", "info", "needs", "recovery", "task"]).union(*[triggers for triggers, _ in DEBUG_LINE_HANDLERS])
+# the keywords of a line outside of a put, the "file" and "received" tokens only matter within one
+DEBUG_KEYWORDS_OUTSIDE_PUT = DEBUG_KEYWORDS - frozenset(["file", "received"])
+
+# handler name -> [lines dispatched, records returned, seconds], filled with --profile-parsers
+parser_profile = {}
+
+def profile_handler(handler):
+    def profiled_handler(parts, keywords):
+        time_start = time.perf_counter()
+        record = handler(parts, keywords)
+        stats = parser_profile.setdefault(handler.__name__, [0, 0, 0.0])
+        stats[0] += 1
+        stats[1] += record is not None
+        stats[2] += time.perf_counter() - time_start
+        return record
+    return profiled_handler
+
+def print_parser_profile():
+    print(f"{'handler':<20}{'dispatched':>12}{'hits':>12}{'time(s)':>12}")
+    for name, (dispatched, hits, seconds) in sorted(parser_profile.items(), key=lambda item: -item[1][2]):
+        print(f"{name:<20}{dispatched:>12}{hits:>12}{seconds:>12.4f}")
+
+def scan_debug_lines(lines, profile=False, putting_file=True):
+    # extract the records of interest from the debug lines in order, the only state is whether a put may be in
+    # progress, a chunk that does not know it assumes it is until its first put or received line, so that different
+    # chunks of the debug log can be scanned in parallel and the extra records are dropped when applied
+    handlers = DEBUG_LINE_HANDLERS
+    if profile:
+        handlers = [(triggers, profile_handler(handler)) for triggers, handler in handlers]
+    for line in lines:
+        parts = line.strip().split(" ")
+        keywords = (DEBUG_KEYWORDS if putting_file else DEBUG_KEYWORDS_OUTSIDE_PUT).intersection(parts)
+        if not keywords:
+            continue
+        for triggers, handler in handlers:
+            if triggers.isdisjoint(keywords):
+                continue
+            record = handler(parts, keywords)
+            if record is None:
+                continue
+            yield record
+            if record[0] == 'put_received':
+                putting_file = False
+            # nothing else is parsed on a put line
+            if record[0] == 'put':
                 putting_file = True
+                break
+
+def scan_debug_chunk(chunk):
+    # scan the lines within [start, end) of the debug log, both offsets are at line boundaries
+    log_file, start, end, profile, putting_file = chunk
+    parser_profile.clear()
+    with open(log_file, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+    records = list(scan_debug_lines(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', errors='replace'), profile=profile, putting_file=putting_file))
+    return records, parser_profile
+
+def split_log_into_chunks(log_file, chunk_size, start, end):
+    boundaries = [start]
+    with open(log_file, 'rb') as file:
+        while boundaries[-1] + chunk_size < end:
+            file.seek(boundaries[-1] + chunk_size)
+            file.readline()
+            if file.tell() >= end:
+                break
+            boundaries.append(file.tell())
+    boundaries.append(end)
+    return [(boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1)]
+
+def scan_debug_chunks_in_parallel(log_file, profile=False):
+    log_name = os.path.basename(log_file)
+    start = parser_state['log_offsets'].get(log_name, 0)
+    end = complete_lines_end(log_file) if follow_logs else os.path.getsize(log_file)
+    # only the first chunk knows whether a put is in progress where it starts
+    chunks = [(log_file, chunk_start, chunk_end, profile, parser_state['putting_file'] if chunk_start == start else True)
+              for chunk_start, chunk_end in split_log_into_chunks(log_file, DEBUG_CHUNK_SIZE, start, end)]
+    print(f"Scanning {len(chunks)} debug chunks with {num_cores} cores...")
+    pbar = tqdm(total=end - start, desc="parsing debug", unit='B', unit_scale=True)
+    chunk_profiles = []
+    with Pool(num_cores) as pool:
+        # imap keeps the chunk order so that the records are applied exactly as in a sequential scan
+        for chunk, (records, chunk_profile) in zip(chunks, pool.imap(scan_debug_chunk, chunks)):
+            pbar.update(chunk[2] - chunk[1])
+            chunk_profiles.append(chunk_profile)
+            yield from records
+    pbar.close()
+    parser_state['log_offsets'][log_name] = end
+    for chunk_profile in chunk_profiles:
+        for name, chunk_stats in chunk_profile.items():
+            stats = parser_profile.setdefault(name, [0, 0, 0.0])
+            for i in range(len(stats)):
+                stats[i] += chunk_stats[i]
+
+def apply_debug_records(records):
+    putting_file = parser_state['putting_file']
+    putting_filename = parser_state['putting_filename']
+
+    for record in records:
+        kind = record[0]
+
+        if kind == 'manager_start':
+            set_time_zone(record[1])
+
+        elif kind == 'worker_id':
+            _, worker_hash, worker_machine_name, worker_ip, worker_port = record
+            worker_addresses.register(worker_ip, worker_port, worker_hash)
+            if worker_hash in worker_info:
+                worker_info[worker_hash]['worker_machine_name'] = worker_machine_name
+                worker_info[worker_hash]['worker_ip'] = worker_ip
+                worker_info[worker_hash]['worker_port'] = worker_port
+
+        elif kind == 'put':
+            putting_file = True
+
+        elif kind == 'put_file':
+            if not putting_file:
                 continue
-            if putting_file:
-                if "file" in parts and parts[parts.index("file") - 1].endswith(':'):
-                    file_id = parts.index("file")
-                    worker_hash = get_worker_hash(parts[file_id - 1])
-                    putting_filename = parts[file_id + 1]
-                    size_in_mb = int(parts[file_id + 2]) / 2**20
-
-                    datestring = parts[0] + " " + parts[1]
-                    timestamp = datestring_to_timestamp(datestring)
-                    if (timestamp > manager_info['time_end']):
-                        print(f"Warning: put start time {timestamp} of file {putting_filename} is after manager end time {manager_info['time_end']}, probably a time zone issue")
-                    if timestamp < manager_info['time_start']:
-                        if abs(timestamp - manager_info['time_start']) < 1:
-                            # manager_info['time_start'] is more accurate
-                            timestamp = worker_info[worker_hash]['time_connected'][0]
-                        elif timestamp == 0:
-                            # we have a special file with start time 0
-                            timestamp = worker_info[worker_hash]['time_connected'][0]
-                        else:
-                            print(f"Warning: put start time {timestamp} of file {putting_filename} on worker {worker_hash} is before manager start time {manager_info['time_start']}")
-                    # this is the first time the file is cached on this worker
-                    # assume the start time is the same as the stage in time if put by the manager
-                    if putting_filename not in worker_info[worker_hash]['disk_update']:
-                        worker_info[worker_hash]['disk_update'][putting_filename] = {
-                            'size(MB)': size_in_mb,
-                            'when_start_stage_in': [timestamp],
-                            'when_stage_in': [],
-                            'when_stage_out': [],
-                        }
-                        update_file_size(putting_filename, size_in_mb)
-                    else:
-                        worker_info[worker_hash]['disk_update'][putting_filename]['when_start_stage_in'].append(timestamp)
-                elif "received" in parts:
-                    if putting_filename is None:
-                        raise ValueError("putting_filename is None")
-                    received_id = parts.index("received")
-                    worker_hash = get_worker_hash(parts[received_id - 1])
-                    datestring = parts[0] + " " + parts[1]
-                    timestamp = datestring_to_timestamp(datestring)
-                    if putting_filename not in worker_info[worker_hash]['disk_update']:
-                        raise ValueError(f"file {putting_filename} not in worker {worker_hash}")
-                    worker_info[worker_hash]['disk_update'][putting_filename]['when_stage_in'].append(timestamp)
-                    putting_file = False
-                    putting_filename = None
-
-            if "puturl" in parts or "puturl_now" in parts:
-                puturl_id = parts.index("puturl") if "puturl" in parts else parts.index("puturl_now")
-                url_source = parts[puturl_id + 1]
-                worker_hash = get_worker_hash(parts[puturl_id - 1])
-                filename = parts[puturl_id + 2]
-                cache_level = parts[puturl_id + 3]
-                size_in_mb = int(parts[puturl_id + 4]) / 2**20
-                datestring = parts[0] + " " + parts[1]
-                timestamp = datestring_to_timestamp(datestring)
-
-                # update disk usage
-                if filename not in worker_info[worker_hash]['disk_update']:
-                    # this is the first time the file is cached on this worker
-                    worker_info[worker_hash]['disk_update'][filename] = {
-                        'size(MB)': size_in_mb,
-                        'when_start_stage_in': [timestamp],
-                        'when_stage_in': [],
-                        'when_stage_out': [],
-                    }
-                    update_file_size(filename, size_in_mb)
+            _, datestring, worker_ip_port_string, putting_filename, size = record
+            worker_hash = worker_addresses.hash_by_ip_port_string(worker_ip_port_string)
+            size_in_mb = int(size) / 2**20
+
+            timestamp = datestring_to_timestamp(datestring)
+            if (timestamp > manager_info['time_end']):
+                print(f"Warning: put start time {timestamp} of file {putting_filename} is after manager end time {manager_info['time_end']}, probably a time zone issue")
+            if timestamp < manager_info['time_start']:
+                if abs(timestamp - manager_info['time_start']) < 1:
+                    # manager_info['time_start'] is more accurate
+                    timestamp = worker_info[worker_hash]['time_connected'][0]
+                elif timestamp == 0:
+                    # we have a special file with start time 0
+                    timestamp = worker_info[worker_hash]['time_connected'][0]
                 else:
-                    # already cached previously, start a new cache here
-                    worker_info[worker_hash]['disk_update'][filename]['when_start_stage_in'].append(timestamp)
-
-            if "cache-update" in parts:
-                # cache-update cachename, &type, &cache_level, &size, &mtime, &transfer_time, &start_time, id
-                # type: VINE_FILE=1, VINE_URL=2, VINE_TEMP=3, VINE_BUFFER=4, VINE_MINI_TASK=5
-                # cache_level: 
-                #    VINE_CACHE_LEVEL_TASK = 0,     /**< Do not cache file at worker. (default) */
-                #    VINE_CACHE_LEVEL_WORKFLOW = 1, /**< File remains in cache of worker until workflow ends. */
-                #    VINE_CACHE_LEVEL_WORKER = 2,   /**< File remains in cache of worker until worker terminates. */
-                #    VINE_CACHE_LEVEL_FOREVER = 3   /**< File remains at execution site when worker terminates. (use with caution) */
-
-                cache_update_id = parts.index("cache-update")
-                filename = parts[cache_update_id + 1]
-                file_type = parts[cache_update_id + 2]
-                cache_level = parts[cache_update_id + 3]
-
-                size_in_mb = int(parts[cache_update_id + 4]) / 2**20
-                wall_time = float(parts[cache_update_id + 6]) / 1e6
-                start_time = float(parts[cache_update_id + 7]) / 1e6
-
-                worker_hash = get_worker_hash(parts[cache_update_id - 1])
-
-                # start time should be after the manager start time
-                if start_time < manager_info['time_start']:
-                    # consider xxx.04224 and xxx.0 as the same time
-                    if abs(start_time - manager_info['time_start']) < 1:
-                        start_time = manager_info['time_start']
-                    else:
-                        print(f"Warning: cache-update start time {start_time} is before manager start time {manager_info['time_start']}")
-
-                # update disk usage
-                if filename not in worker_info[worker_hash]['disk_update']:
-                    # this is the first time the file is cached on this worker
-                    worker_info[worker_hash]['disk_update'][filename] = {
-                        'size(MB)': size_in_mb,
-                        'when_start_stage_in': [start_time],
-                        'when_stage_in': [start_time + wall_time],
-                        'when_stage_out': [],
-                    }
-                    update_file_size(filename, size_in_mb)
+                    print(f"Warning: put start time {timestamp} of file {putting_filename} on worker {worker_hash} is before manager start time {manager_info['time_start']}")
+            # this is the first time the file is cached on this worker
+            # assume the start time is the same as the stage in time if put by the manager
+            if putting_filename not in worker_info[worker_hash]['disk_update']:
+                worker_info[worker_hash]['disk_update'][putting_filename] = {
+                    'size(MB)': size_in_mb,
+                    'when_start_stage_in': [timestamp],
+                    'when_stage_in': [],
+                    'when_stage_out': [],
+                }
+                update_file_size(putting_filename, size_in_mb)
+            else:
+                worker_info[worker_hash]['disk_update'][putting_filename]['when_start_stage_in'].append(timestamp)
+
+        elif kind == 'put_received':
+            if not putting_file:
+                continue
+            _, datestring, worker_ip_port_string = record
+            if putting_filename is None:
+                raise ValueError("putting_filename is None")
+            worker_hash = worker_addresses.hash_by_ip_port_string(worker_ip_port_string)
+            timestamp = datestring_to_timestamp(datestring)
+            if putting_filename not in worker_info[worker_hash]['disk_update']:
+                raise ValueError(f"file {putting_filename} not in worker {worker_hash}")
+            worker_info[worker_hash]['disk_update'][putting_filename]['when_stage_in'].append(timestamp)
+            putting_file = False
+            putting_filename = None
+
+        elif kind == 'puturl':
+            _, datestring, worker_ip_port_string, filename, size_in_mb = record
+            worker_hash = worker_addresses.hash_by_ip_port_string(worker_ip_port_string)
+            timestamp = datestring_to_timestamp(datestring)
+
+            # update disk usage
+            if filename not in worker_info[worker_hash]['disk_update']:
+                # this is the first time the file is cached on this worker
+                worker_info[worker_hash]['disk_update'][filename] = {
+                    'size(MB)': size_in_mb,
+                    'when_start_stage_in': [timestamp],
+                    'when_stage_in': [],
+                    'when_stage_out': [],
+                }
+                update_file_size(filename, size_in_mb)
+            else:
+                # already cached previously, start a new cache here
+                worker_info[worker_hash]['disk_update'][filename]['when_start_stage_in'].append(timestamp)
+
+        elif kind == 'cache_update':
+            _, worker_ip_port_string, filename, size_in_mb, wall_time, start_time = record
+            worker_hash = worker_addresses.hash_by_ip_port_string(worker_ip_port_string)
+
+            # start time should be after the manager start time
+            if start_time < manager_info['time_start']:
+                # consider xxx.04224 and xxx.0 as the same time
+                if abs(start_time - manager_info['time_start']) < 1:
+                    start_time = manager_info['time_start']
                 else:
-                    # the start time has been indicated in the puturl message, so we don't need to update it here
-                    worker_info[worker_hash]['disk_update'][filename]['when_stage_in'].append(start_time + wall_time)
-
-            if ("infile" in parts or "outfile" in parts) and "needs" not in parts:
-                file_id = parts.index("infile") if "infile" in parts else parts.index("outfile")
-                worker_hash = get_worker_hash(parts[file_id - 1])
-                manager_site_name = parts[file_id + 2]
-
-                # update disk usage
-                if manager_site_name in worker_info[worker_hash]['disk_update']:
-                    del worker_info[worker_hash]['disk_update'][manager_site_name]
-            
-            if "unlink" in parts:
-                unlink_id = parts.index("unlink")
-                filename = parts[unlink_id + 1]
-                worker_ip, worker_port = parts[unlink_id - 1][1:-2].split(':')
-                datestring = parts[0] + " " + parts[1]
-                timestamp = datestring_to_timestamp(datestring)
-                worker_hash = worker_address_hash_map[(worker_ip, worker_port)]
-                worker_id = worker_info[worker_hash]['worker_id']
-                
-                if filename not in worker_info[worker_hash]['disk_update']:
-                    print(f"Warning: file {filename} not in worker {worker_hash}")
-                    print(f"workers: {get_worker_ip_port_by_hash(worker_address_hash_map, worker_hash)}")
-                worker_when_start_stage_in = worker_info[worker_hash]['disk_update'][filename]['when_start_stage_in']
-                worker_when_stage_in = worker_info[worker_hash]['disk_update'][filename]['when_stage_in']
-                worker_when_stage_out = worker_info[worker_hash]['disk_update'][filename]['when_stage_out']
-                worker_when_stage_out.append(timestamp)
-
-                # in some case when using puturl or puturl_now, we may fail to receive the cache-update message, use the start time as the stage in time
-                if len(worker_when_start_stage_in) != len(worker_when_stage_in):
-                    for i in range(len(worker_when_start_stage_in) - len(worker_when_stage_in)):
-                        worker_when_stage_in.append(worker_when_start_stage_in[len(worker_when_start_stage_in) - i - 1])
-
-                # this indicates the fully lost file, update the producer's when_output_fully_lost if any
-                if len(worker_when_stage_out) == len(worker_when_stage_in) and len(file_info[filename]['producers']) != 0:
-                    producers = file_info[filename]['producers']
-                    i = len(producers) - 1
-                    while i >= 0:
-                        producer = producers[i]
-                        if task_info[(producer, task_try_count[producer])]['time_worker_end'] < timestamp:
-                            task_info[(producer, task_try_count[producer])]['when_output_fully_lost'] = timestamp
-                            break
-                        i -= 1
-                
-            if "Submitted" in parts and "recovery" in parts and "task" in parts:
-                task_id = int(parts[parts.index("task") + 1])
-                try_count = task_try_count[task_id]
-                for try_id in range(1, try_count + 1):
-                    task_info[(task_id, try_id)]['is_recovery_task'] = True
-                    task_info[(task_id, try_id)]['category'] = "recovery_task"
-        pbar.close()
+                    print(f"Warning: cache-update start time {start_time} is before manager start time {manager_info['time_start']}")
+
+            # update disk usage
+            if filename not in worker_info[worker_hash]['disk_update']:
+                # this is the first time the file is cached on this worker
+                worker_info[worker_hash]['disk_update'][filename] = {
+                    'size(MB)': size_in_mb,
+                    'when_start_stage_in': [start_time],
+                    'when_stage_in': [start_time + wall_time],
+                    'when_stage_out': [],
+                }
+                update_file_size(filename, size_in_mb)
+            else:
+                # the start time has been indicated in the puturl message, so we don't need to update it here
+                worker_info[worker_hash]['disk_update'][filename]['when_stage_in'].append(start_time + wall_time)
+
+        elif kind == 'infile':
+            _, worker_ip_port_string, manager_site_name = record
+            worker_hash = worker_addresses.hash_by_ip_port_string(worker_ip_port_string)
+
+            # update disk usage
+            if manager_site_name in worker_info[worker_hash]['disk_update']:
+                del worker_info[worker_hash]['disk_update'][manager_site_name]
+
+        elif kind == 'unlink':
+            _, datestring, worker_ip, worker_port, filename = record
+            timestamp = datestring_to_timestamp(datestring)
+            worker_hash = worker_addresses.hash_by_ip_port(worker_ip, worker_port)
+            worker_id = worker_info[worker_hash]['worker_id']
+
+            if filename not in worker_info[worker_hash]['disk_update']:
+                print(f"Warning: file {filename} not in worker {worker_hash}")
+                print(f"workers: {worker_addresses.ip_ports_by_hash(worker_hash)}")
+            worker_when_start_stage_in = worker_info[worker_hash]['disk_update'][filename]['when_start_stage_in']
+            worker_when_stage_in = worker_info[worker_hash]['disk_update'][filename]['when_stage_in']
+            worker_when_stage_out = worker_info[worker_hash]['disk_update'][filename]['when_stage_out']
+            worker_when_stage_out.append(timestamp)
+
+            # in some case when using puturl or puturl_now, we may fail to receive the cache-update message, use the start time as the stage in time
+            if len(worker_when_start_stage_in) != len(worker_when_stage_in):
+                for i in range(len(worker_when_start_stage_in) - len(worker_when_stage_in)):
+                    worker_when_stage_in.append(worker_when_start_stage_in[len(worker_when_start_stage_in) - i - 1])
+
+            # this indicates the fully lost file, update the producer's when_output_fully_lost if any
+            if len(worker_when_stage_out) == len(worker_when_stage_in) and len(file_info[filename]['producers']) != 0:
+                producers = file_info[filename]['producers']
+                i = len(producers) - 1
+                while i >= 0:
+                    producer_row = task_info.row(producers[i], task_try_count[producers[i]])
+                    if task_info['time_worker_end'][producer_row] < timestamp:
+                        task_info['when_output_fully_lost'][producer_row] = timestamp
+                        break
+                    i -= 1
+
+        elif kind == 'recovery':
+            # marked when finalized, the debug log of a running manager can be ahead of the transactions
+            parser_state.setdefault('recovery_tasks', set()).add(record[1])
+
+    parser_state['putting_file'] = putting_file
+    parser_state['putting_filename'] = putting_filename
+
+def parse_debug(parallel=False, profile=False):
+    if parallel:
+        records = scan_debug_chunks_in_parallel(debug, profile=profile)
+    else:
+        records = scan_debug_lines(read_log_lines(debug, "parsing debug"), profile=profile, putting_file=parser_state['putting_file'])
+    apply_debug_records(records)
+    if profile:
+        print_parser_profile()
+
+def finalize_debug():
+    global worker_info
+
+    for task_id in parser_state.get('recovery_tasks', ()):
+        for try_id in range(1, task_try_count.get(task_id, 0) + 1):
+            row = task_info.row(task_id, try_id)
+            task_info['is_recovery_task'][row] = True
+            task_info.set_string('category', row, "recovery_task")
 
     for worker_hash, worker in worker_info.items():
         for filename, worker_disk_update in worker['disk_update'].items():
@@ -602,8 +1113,7 @@ def parse_debug():
                 print(f"Warning: file {filename} stage out more than stage in for worker {worker_hash}, stage_in: {len_stage_in}, stage_out: {len_stage_out}")
                 worker_disk_update['when_stage_out'] = worker_disk_update['when_stage_out'][:len_stage_in]
                 len_stage_out = len_stage_in
-            if filename not in file_info:
-                raise ValueError(f"file {filename} not in file_info")
+            get_file_info(filename)
             # add the worker holding information
             for i in range(len_stage_out):
                 worker_holding = {
@@ -625,9 +1135,7 @@ def parse_debug():
 
     # filter out the workers that are not active
     manager_info['total_workers'] = len(worker_info)
-    active_workers = set()
-    for task in task_info.values():
-        active_workers.add(task['worker_committed'])
+    active_workers = set(task_info.string_values('worker_committed'))
     worker_info = {worker_hash: worker for worker_hash, worker in worker_info.items() if worker_hash in active_workers}
     worker_info = {k: v for k, v in sorted(worker_info.items(), key=lambda item: item[1]['time_connected'])}
     manager_info['active_workers'] = len(worker_info)
@@ -637,9 +1145,10 @@ def parse_debug():
     for worker in worker_info.values():
         worker['worker_id'] = worker_id
         worker_id += 1
-    for task in task_info.values():
-        if task['worker_committed']:
-            task['worker_id'] = worker_info[task['worker_committed']]['worker_id']
+    # worker_id of each interned worker_committed, the last entry is for tasks never committed
+    worker_ids = np.array([worker_info[worker_hash]['worker_id'] if worker_hash in worker_info else -1
+                           for worker_hash in task_info.strings['worker_committed']] + [-1], dtype=np.int64)
+    task_info['worker_id'][:len(task_info)] = worker_ids[task_info['worker_committed'][:len(task_info)]]
     for library in library_info.values():
         if library['worker_committed']:
             library['worker_id'] = worker_info[library['worker_committed']]['worker_id']
@@ -675,38 +1184,40 @@ def store_file_info():
     # save the file_info into a csv file, should use filename as key
     file_info_df = pd.DataFrame.from_dict(file_info, orient='index')
     file_info_df.index.name = 'filename'
-    file_info_df.to_csv(os.path.join(dirname, 'file_info.csv'))
+    write_table(file_info_df, 'file_info.csv', index=True)
 
 
 def parse_daskvine_log():
     # check if the daskvine exists
-    try:
-        with open(daskvine_log, 'r') as file:
-            pass
-    except FileNotFoundError:
+    if not os.path.exists(daskvine_log):
         return
-    
-    total_lines = 0
-    with open(daskvine_log, 'r') as file:
-        for line in file:
-            total_lines += 1
 
-    with open(daskvine_log, 'r') as file:
-        pbar = tqdm(total=total_lines, desc="parsing daskvine log")
-        for line in file:
-            pbar.update(1)
-            parts = line.strip().split(" ")
-
-            event, timestamp, task_id = parts[0], int(parts[1]), int(parts[2])
-            try_count = task_try_count[task_id]
-            if event == "submitted":
-                for try_id in range(1, try_count + 1):
-                    task_info[(task_id, try_id)]['when_submitted_by_daskvine'] = timestamp
-            if event == 'received':
-                for try_id in range(1, try_count + 1):
-                    task_info[(task_id, try_id)]['when_received_by_daskvine'] = timestamp
+    # the times are kept in parser_state, so that with --follow only the new lines are read and the tries of a task
+    # that show up in a later run still get them
+    daskvine_times = parser_state.setdefault('daskvine_times', {})
+    for line in read_log_lines(daskvine_log, "parsing daskvine log"):
+        parts = line.strip().split(" ")
 
-        pbar.close()
+        event, timestamp, task_id = parts[0], int(parts[1]), int(parts[2])
+        if event == "submitted":
+            daskvine_times.setdefault(task_id, [None, None])[0] = timestamp
+        if event == 'received':
+            daskvine_times.setdefault(task_id, [None, None])[1] = timestamp
+
+def finalize_daskvine_log():
+    if not os.path.exists(daskvine_log):
+        return
+
+    task_info.add_column('when_submitted_by_daskvine', 'float')
+    task_info.add_column('when_received_by_daskvine', 'float')
+    for task_id, (when_submitted, when_received) in parser_state['daskvine_times'].items():
+        # a task may not be in the transactions yet
+        for try_id in range(1, task_try_count.get(task_id, 0) + 1):
+            row = task_info.row(task_id, try_id)
+            if when_submitted is not None:
+                task_info['when_submitted_by_daskvine'][row] = when_submitted
+            if when_received is not None:
+                task_info['when_received_by_daskvine'][row] = when_received
 ############################################################################################################
 
 
@@ -746,7 +1257,8 @@ def generate_worker_summary(worker_disk_usage_df):
         if row['num_tasks_completed'] > 0:
             total_execution_time = 0
             for task_id in worker_info[worker_hash]['tasks_completed']:
-                total_execution_time += task_info[(task_id, task_try_count[task_id])][task_finish_timestamp] - task_info[(task_id, task_try_count[task_id])][task_start_timestamp]
+                task_row = task_info.row(task_id, task_try_count[task_id])
+                total_execution_time += task_info[task_finish_timestamp][task_row] - task_info[task_start_timestamp][task_row]
             row['avg_task_runtime(s)'] = total_execution_time / row['num_tasks_completed']
         if len(info['time_connected']) != len(info['time_disconnected']):
             info['time_disconnected'].append(manager_info['time_end'])
@@ -760,7 +1272,7 @@ def generate_worker_summary(worker_disk_usage_df):
 
     worker_summary_df = pd.DataFrame(rows)
     worker_summary_df = worker_summary_df.sort_values(by=['worker_id'], ascending=[True])
-    worker_summary_df.to_csv(os.path.join(dirname, 'worker_summary.csv'), index=False)
+    write_table(worker_summary_df, 'worker_summary.csv')
 
     return worker_summary_df
 
@@ -777,33 +1289,36 @@ def generate_other_statistics(task_df, worker_summary_df):
         info['min_task_execution_time(s)'] = min(info['tasks_execution_time(s)'])
     category_info_df = pd.DataFrame.from_dict(category_info, orient='index')
     category_info_df.index.name = 'category'
-    category_info_df.to_csv(os.path.join(dirname, 'category_info.csv'), index=True)
+    write_table(category_info_df, 'category_info.csv', index=True)
     #####################################################
 
     #####################################################
     # Add info into manager_info
     print("Generating manager_info.csv...")
 
-    worker_connection_events_df = pd.concat([
-        pd.DataFrame({'time': worker_summary_df['time_connected'], 'type': 'connect', 'worker_id': worker_summary_df['worker_id']}),
-        pd.DataFrame({'time': worker_summary_df['time_disconnected'], 'type': 'disconnect', 'worker_id': worker_summary_df['worker_id']})
-    ])
-    worker_connection_events_df = worker_connection_events_df.sort_values('time')
-
-    current_concurrent_workers = 0
-    concurrent_workers_list = []
-    worker_connection_events = []
-    worker_connection_events.append((manager_info['time_start'], 0, 'manager_start', -1))
-    for _, event in worker_connection_events_df.iterrows():
-        if event['type'] == 'connect':
-            current_concurrent_workers += 1
-        else:
-            current_concurrent_workers -= 1
-        concurrent_workers_list.append(current_concurrent_workers)
-    worker_connection_events_df['concurrent_workers'] = concurrent_workers_list
-    worker_connection_events_df.to_csv(os.path.join(dirname, 'worker_concurrency.csv'), index=False)
-
-    manager_info['max_concurrent_workers'] = max([x[1] for x in worker_connection_events])
+    # every connection period is a +1 at time_connected and a -1 at time_disconnected
+    num_connections = len(worker_summary_df)
+    worker_connection_events_df = pd.DataFrame({
+        'time': np.concatenate([worker_summary_df['time_connected'].to_numpy(dtype=np.float64), worker_summary_df['time_disconnected'].to_numpy(dtype=np.float64)]),
+        'type': np.repeat(['connect', 'disconnect'], num_connections),
+        'worker_id': np.concatenate([worker_summary_df['worker_id'].to_numpy(), worker_summary_df['worker_id'].to_numpy()]),
+    })
+    delta = np.repeat(np.array([1, -1], dtype=np.int64), num_connections)
+    cores = np.concatenate([worker_summary_df['cores'].to_numpy(dtype=np.float64)] * 2) * delta
+    order = np.argsort(worker_connection_events_df['time'].to_numpy(), kind='stable')
+    worker_connection_events_df = worker_connection_events_df.iloc[order]
+    worker_connection_events_df['concurrent_workers'] = np.cumsum(delta[order])
+    write_table(worker_connection_events_df, 'worker_concurrency.csv')
+
+    times = worker_connection_events_df['time'].to_numpy()
+    concurrent_workers = worker_connection_events_df['concurrent_workers'].to_numpy()
+    concurrent_cores = np.cumsum(cores[order])
+    # the counts in effect after each distinct timestamp, so that the order of events at the same time does not matter
+    is_last = np.r_[times[1:] != times[:-1], True]
+    manager_info['max_concurrent_workers'] = int(concurrent_workers[is_last].max()) if num_connections else 0
+    # the areas under the step functions, from the first connection to the last disconnection
+    manager_info['worker_seconds_available'] = round(float(np.sum(concurrent_workers[:-1] * np.diff(times))), 4) if num_connections else 0
+    manager_info['core_seconds_available'] = round(float(np.sum(concurrent_cores[:-1] * np.diff(times))), 4) if num_connections else 0
     # a task may be submitted multiple times
     manager_info['tasks_submitted'] = len(task_info)
     manager_info['time_start_human'] = timestamp_to_datestring(manager_info['time_start'])[:22]
@@ -811,18 +1326,132 @@ def generate_other_statistics(task_df, worker_summary_df):
     # the max try_id in task_df
     manager_info['max_task_try_count'] = task_df['try_id'].max()
     manager_info_df = pd.DataFrame([manager_info])
-    manager_info_df.to_csv(os.path.join(dirname, 'manager_info.csv'), index=False)
+    write_table(manager_info_df, 'manager_info.csv')
     #####################################################
 
 def generate_library_summary():
     library_df = pd.DataFrame.from_dict(library_info, orient='index')
-    library_df.to_csv(os.path.join(dirname, 'library_summary.csv'), index=False)
+    write_table(library_df, 'library_summary.csv')
 
+    # the warm-up cost of each library instance on its worker
+    print("Generating library_lifecycle.csv...")
+    rows = []
+    for task_id, library in library_info.items():
+        rows.append({
+            'task_id': task_id,
+            'worker_id': library['worker_id'],
+            'worker_committed': library['worker_committed'],
+            'when_running': library['when_running'],
+            'when_sent': library['when_sent'],
+            'when_started': library['when_started'],
+            'when_retrieved': library['when_retrieved'],
+        })
+    library_lifecycle_df = pd.DataFrame(rows, columns=['task_id', 'worker_id', 'worker_committed', 'when_running', 'when_sent', 'when_started', 'when_retrieved'])
+    time_columns = ['when_running', 'when_sent', 'when_started', 'when_retrieved']
+    library_lifecycle_df[time_columns] = library_lifecycle_df[time_columns].astype(float)
+    # timestamps have microsecond resolution
+    library_lifecycle_df['time_to_send(s)'] = (library_lifecycle_df['when_sent'] - library_lifecycle_df['when_running']).round(6)
+    library_lifecycle_df['time_to_start(s)'] = (library_lifecycle_df['when_started'] - library_lifecycle_df['when_sent']).round(6)
+    library_lifecycle_df['time_serving(s)'] = (library_lifecycle_df['when_retrieved'] - library_lifecycle_df['when_started']).round(6)
+    library_lifecycle_df = library_lifecycle_df.sort_values(by=['worker_id', 'when_running'], kind='stable')
+    write_table(library_lifecycle_df, 'library_lifecycle.csv')
+
+
+def fill_when_next_ready(task_df, rows):
+    # if the when_next_ready is na, that means the manager exited before the task was ready, set it to the end of
+    # the worker connection that the task was running in
+    rows = rows[np.isnan(task_df['when_next_ready'].to_numpy()[rows])]
+    if len(rows) == 0:
+        return
+    tasks = pd.DataFrame({'row': rows, 'worker_committed': task_df['worker_committed'].to_numpy()[rows],
+                          'when_running': task_df['when_running'].to_numpy()[rows]})
+    connections = []
+    for worker_hash in tasks['worker_committed'].unique():
+        worker = worker_info[worker_hash]
+        # the worker is still connected
+        worker['time_disconnected'].extend([manager_info['time_end']] * (len(worker['time_connected']) - len(worker['time_disconnected'])))
+        connections.append(pd.DataFrame({'worker_committed': worker_hash, 'connection': np.arange(len(worker['time_connected'])),
+                                         'time_connected': worker['time_connected'], 'time_disconnected': worker['time_disconnected']}))
+    tasks = tasks.merge(pd.concat(connections), on='worker_committed')
+    tasks = tasks[(tasks['time_connected'] < tasks['when_running']) & (tasks['time_disconnected'] > tasks['when_running'])]
+    # the last connection that contains when_running wins
+    tasks = tasks.sort_values(['row', 'connection']).drop_duplicates('row', keep='last')
+    task_df.loc[tasks['row'].to_numpy(), 'when_next_ready'] = tasks['time_disconnected'].to_numpy()
+
+def sum_file_sizes(name, rows, file_sizes):
+    # the sizes are summed in file order so that they match a plain sum over the file list
+    offsets, codes = task_info.file_offsets(name)
+    counts = np.diff(offsets)
+    total = np.bincount(np.repeat(np.arange(task_info.num_rows), counts), weights=file_sizes[codes], minlength=task_info.num_rows)
+    return np.round(total[rows], 4)
+
+def find_critical_parents(task_df, rows):
+    # every (row, input file, producer) triple of the given rows, in the order of the input files and producers
+    offsets, codes = task_info.file_offsets('input_files')
+    counts = np.diff(offsets)[rows]
+    pair_rows = np.repeat(rows, counts)
+    pair_codes = codes[np.arange(counts.sum()) + np.repeat(offsets[rows] - (np.cumsum(counts) - counts), counts)]
+
+    producers = [file_info[filename]['producers'] for filename in task_info.file_names]
+    producer_counts = np.array([len(p) for p in producers], dtype=np.int64)
+    producer_offsets = np.zeros(len(producers) + 1, dtype=np.int64)
+    np.cumsum(producer_counts, out=producer_offsets[1:])
+    producer_ids = np.fromiter((p for file_producers in producers for p in file_producers), dtype=np.int64, count=producer_offsets[-1])
+
+    triple_counts = producer_counts[pair_codes]
+    triple_pairs = np.repeat(np.arange(len(pair_codes)), triple_counts)
+    within = np.arange(len(triple_pairs)) - np.repeat(np.cumsum(triple_counts) - triple_counts, triple_counts)
+    parents = producer_ids[producer_offsets[pair_codes][triple_pairs] + within]
+    triple_rows = pair_rows[triple_pairs]
+
+    # each parent is taken at its latest try
+    unique_parents, parent_ids = np.unique(parents, return_inverse=True)
+    parent_rows = np.array([task_info.row(p, task_try_count[p]) for p in unique_parents.tolist()], dtype=np.int64)[parent_ids.reshape(-1)]
+    waiting_time = task_df[task_start_timestamp].to_numpy()[triple_rows] - task_info[task_finish_timestamp][parent_rows]
+    # a negative period means that the input file was lost after this task was done and it was produced again
+    valid = (waiting_time >= 0) & (waiting_time < 1e8)
+    triple_rows, parents, parent_rows, waiting_time = triple_rows[valid], parents[valid], parent_rows[valid], waiting_time[valid]
+
+    # groupby row and take the shortest waiting time, the first triple wins a tie
+    order = np.lexsort((np.arange(len(waiting_time)), waiting_time, triple_rows))
+    first = order[np.r_[True, triple_rows[order][1:] != triple_rows[order][:-1]]] if len(order) else order
+
+    output_offsets, output_codes = task_info.file_offsets('output_files')
+    filenames = np.array(task_info.file_names, dtype=object)
+    return triple_rows[first], parents[first], filenames[output_codes[output_offsets[parent_rows[first]]]], waiting_time[first]
+
+def handle_tasks(task_df, handled):
+    rows = np.flatnonzero(handled)
+    core_starts = task_info.columns['core_start'][rows]
+    core_id = task_df['core_id'].to_numpy(copy=True)
+    core_id[rows] = np.array(task_info.core_ids, dtype=np.int64)[core_starts]
+    task_df['core_id'] = core_id
+
+    fill_when_next_ready(task_df, rows)
+
+    file_sizes = np.array([file_info[filename]['size(MB)'] for filename in task_info.file_names], dtype=np.float64)
+    for name in ['input_files', 'output_files']:
+        sizes = task_df[f'size_{name}(MB)'].to_numpy(dtype=np.float64, copy=True)
+        sizes[rows] = sum_file_sizes(name, rows, file_sizes)
+        task_df[f'size_{name}(MB)'] = sizes
+
+    critical_rows, critical_parents, critical_input_files, wait_times = find_critical_parents(task_df, rows)
+    critical_parent = task_df['critical_parent'].to_numpy(dtype=np.float64, copy=True)
+    critical_parent[critical_rows] = critical_parents
+    task_df['critical_parent'] = critical_parent
+    task_df.loc[critical_rows, 'critical_input_file'] = critical_input_files
+    wait_time = task_df['critical_input_file_wait_time'].to_numpy(dtype=np.float64, copy=True)
+    wait_time[critical_rows] = wait_times
+    task_df['critical_input_file_wait_time'] = wait_time
+
+    output_fully_lost = task_df['when_output_fully_lost'].to_numpy(copy=True)
+    output_fully_lost[rows[task_df['when_done'].notna().to_numpy()[rows] & task_df['when_output_fully_lost'].isna().to_numpy()[rows]]] = manager_info['time_end']
+    task_df['when_output_fully_lost'] = output_fully_lost
 
 def generate_task_df():
     print("Generating task.csv...")
 
-    task_df = pd.DataFrame.from_dict(task_info, orient='index')
+    task_df = task_info.to_dataframe()
     # ensure that the running time is not greater than the done time
     task_df['when_running'] = np.where(
         task_df['time_worker_start'].gt(0) & task_df['time_worker_start'].notna(),
@@ -830,7 +1459,7 @@ def generate_task_df():
         task_df['when_running']
     )
     
-    task_df.to_csv(os.path.join(dirname, 'task.csv'), index=False)
+    write_table(task_df, 'task.csv')
 
     is_done = task_df['when_done'].notnull()
     is_failed_manager = task_df['when_running'].isnull() & task_df['when_ready'].notnull()
@@ -840,90 +1469,86 @@ def generate_task_df():
     manager_info['tasks_failed_on_manager'] = is_failed_manager.sum()
     manager_info['tasks_failed_on_worker'] = is_failed_worker.sum()
 
-    def calculate_total_size_of_files(files):
-        return round(sum([file_info[file]['size(MB)'] for file in files]), 4)
-
-    def handle_each_task(task):
-        # assume that every task consumes 1 core as of now
-        cores = task['core_id']
-        if len(cores) == 0:
-            return task
-        task['core_id'] = cores[0]
-
-        # if the when_next_ready is na, that means the manager exited before the task was ready, set it to the worker end time
-        if pd.isna(task['when_next_ready']):
-            worker = worker_info[task['worker_committed']]
-            for i in range(len(worker['time_connected'])):
-                if len(worker['time_disconnected']) != len(worker['time_connected']):
-                    # worker is still connected
-                    worker['time_disconnected'].append(manager_info['time_end'])
-                else:
-                    if worker['time_connected'][i] < task['when_running'] and worker['time_disconnected'][i] > task['when_running']:
-                        task['when_next_ready'] = worker['time_disconnected'][i]
-        
-        # calculate the total size of input and output files
-        task['size_input_files(MB)'] = calculate_total_size_of_files(task['input_files'])
-        task['size_output_files(MB)'] = calculate_total_size_of_files(task['output_files'])
-        # calculate the critical parent
-        parents = []
-        for input_file in task['input_files']:
-            file_producers = file_info[input_file]['producers']
-            if file_producers:
-                parents.extend(file_producers)
-        # find the critical input file
-        shorted_waiting_time = 1e8
-        for p in parents:
-            # exclude recovery tasks
-            # if task['is_recovery_task']:
-            #    continue
-            parent_task = task_info[(p, task_try_count[p])]
-            time_period = task[task_start_timestamp] - parent_task[task_finish_timestamp]
-
-            if time_period < 0:
-                # it means that this input file is lost after this task is done and it is used as another task's input file
-                continue
-            if time_period < shorted_waiting_time:
-                shorted_waiting_time = task[task_start_timestamp] - parent_task[task_finish_timestamp]
-                task['critical_parent'] = int(p)
-                task['critical_input_file'] = parent_task['output_files'][0]
-                task['critical_input_file_wait_time'] = shorted_waiting_time
-        
-        if not pd.isna(task['when_done']) and pd.isna(task['when_output_fully_lost']):
-            task['when_output_fully_lost'] = manager_info['time_end']
-
-        return task
-    
     # the concurrent tasks throughout the manager's lifetime skip if when_running is na
-    scheduled_task_df = task_df.dropna(subset=['when_running'])
-    task_starting_df = pd.DataFrame({
-        'time': scheduled_task_df['when_running'],
-        'task_id': scheduled_task_df['task_id'],
-        'worker_id': scheduled_task_df['worker_id'],
-        'category': scheduled_task_df['category'],
-        'type': 1
-    })
-
-    # skip if when_waiting_retrieval is na, use when_next_ready instead
-    task_ending_df = pd.DataFrame({
-        'time': scheduled_task_df.apply(lambda row: row['when_waiting_retrieval'] if pd.notna(row['when_waiting_retrieval']) else row['when_next_ready'], axis=1).dropna(),
-        'task_id': scheduled_task_df['task_id'],
-        'worker_id': scheduled_task_df['worker_id'],
-        'category': scheduled_task_df['category'],
-        'type': -1
+    scheduled_task_df = task_df[task_df['when_running'].notna()]
+    # a task ends when it is waiting for retrieval, or when it is ready again after failing on the worker, skip if both are na
+    ending_time = scheduled_task_df['when_waiting_retrieval'].fillna(scheduled_task_df['when_next_ready'])
+    ended_task_df = scheduled_task_df[ending_time.notna()]
+    events_df = pd.DataFrame({
+        'time': np.concatenate([scheduled_task_df['when_running'].to_numpy(), ending_time.dropna().to_numpy()]),
+        'task_id': np.concatenate([scheduled_task_df['task_id'].to_numpy(), ended_task_df['task_id'].to_numpy()]),
+        'worker_id': np.concatenate([scheduled_task_df['worker_id'].to_numpy(), ended_task_df['worker_id'].to_numpy()]),
+        'category': np.concatenate([scheduled_task_df['category'].to_numpy(), ended_task_df['category'].to_numpy()]),
+        'type': np.repeat(np.array([1, -1], dtype=np.int64), [len(scheduled_task_df), len(ended_task_df)]),
     })
 
-    events_df = pd.concat([task_starting_df, task_ending_df]).sort_values('time')
-
-    events_df = events_df.sort_values('time')
+    # a start comes before an end at the same time
+    events_df = events_df.sort_values('time', kind='stable', ignore_index=True)
     events_df['concurrent_tasks'] = events_df['type'].cumsum()
-    events_df.to_csv(os.path.join(dirname, 'task_concurrency.csv'), index=False)
+    if concurrency_breakdown:
+        events_df['concurrent_tasks_in_category'] = events_df.groupby('category', sort=False, dropna=False)['type'].cumsum()
+        events_df['concurrent_tasks_on_worker'] = events_df.groupby('worker_id', sort=False)['type'].cumsum()
+    write_table(events_df, 'task_concurrency.csv')
 
-    task_df[is_done].apply(handle_each_task, axis=1).to_csv(os.path.join(dirname, 'task_done.csv'), index=False)
-    task_df[is_failed_manager].apply(handle_each_task, axis=1).to_csv(os.path.join(dirname, 'task_failed_on_manager.csv'), index=False)
-    task_df[is_failed_worker].apply(handle_each_task, axis=1).to_csv(os.path.join(dirname, 'task_failed_on_worker.csv'), index=False)
+    # assume that every task consumes 1 core as of now, tries that got no cores are written as they are
+    has_cores = pd.Series(task_info.columns['core_count'][:task_info.num_rows] > 0, index=task_df.index)
+    handled = has_cores & (is_done | is_failed_manager | is_failed_worker)
+    done_task_df = task_df.copy()
+    handle_tasks(done_task_df, handled.to_numpy())
+
+    write_table(done_task_df[is_done], 'task_done.csv')
+    write_table(done_task_df[is_failed_manager], 'task_failed_on_manager.csv')
+    write_table(done_task_df[is_failed_worker], 'task_failed_on_worker.csv')
 
     return task_df
 
+def generate_worker_core_occupancy():
+    print("Generating worker_core_occupancy.csv...")
+
+    # one row per core a task try held, for core-level utilization heatmaps
+    rows = []
+    for worker_hash, allocator in worker_core_allocators.items():
+        worker_id = worker_info[worker_hash]['worker_id'] if worker_hash in worker_info else -1
+        for core_id, task_id, try_id, when_allocated, when_released in allocator.intervals:
+            rows.append((worker_id, worker_hash, core_id, task_id, try_id, when_allocated, when_released))
+    core_occupancy_df = pd.DataFrame(rows, columns=['worker_id', 'worker_hash', 'core_id', 'task_id', 'try_id', 'when_allocated', 'when_released'])
+    # the cores that were never released are held until the manager ends
+    core_occupancy_df['when_released'] = core_occupancy_df['when_released'].fillna(manager_info['time_end'])
+    core_occupancy_df = core_occupancy_df.sort_values(by=['worker_id', 'core_id', 'when_allocated'], kind='stable')
+    write_table(core_occupancy_df, 'worker_core_occupancy.csv')
+
+def generate_filename_index():
+    print("Generating filename_index...")
+    index_dir = os.path.join(dirname, 'filename_index')
+    os.makedirs(index_dir, exist_ok=True)
+
+    # exact filename -> task_id of the done tasks that consume or produce it
+    file_hashes, task_ids = [], []
+    input_files, output_files = task_info.file_lists('input_files'), task_info.file_lists('output_files')
+    for row in np.flatnonzero(~np.isnan(task_info['when_done'][:len(task_info)])):
+        for filename in set(input_files[row]) | set(output_files[row]):
+            file_hashes.append(filename_hash(filename))
+            task_ids.append(task_info['task_id'][row])
+    task_file_hashes, task_file_offsets, task_ids = build_postings(file_hashes, task_ids)
+
+    # filename trigram -> row of the file in file_info, for substring search
+    trigrams, file_rows = [], []
+    for file_row, filename in enumerate(file_info):
+        for trigram in filename_trigrams(filename):
+            trigrams.append(trigram)
+            file_rows.append(file_row)
+    file_trigrams, file_trigram_offsets, file_rows = build_postings(trigrams, file_rows)
+
+    np.save(os.path.join(index_dir, 'task_file_hashes.npy'), task_file_hashes)
+    np.save(os.path.join(index_dir, 'task_file_offsets.npy'), task_file_offsets)
+    np.save(os.path.join(index_dir, 'task_ids.npy'), task_ids)
+    np.save(os.path.join(index_dir, 'file_trigrams.npy'), file_trigrams)
+    np.save(os.path.join(index_dir, 'file_trigram_offsets.npy'), file_trigram_offsets)
+    np.save(os.path.join(index_dir, 'file_rows.npy'), file_rows)
+    # written last, the server checks it against the tables before using the index
+    with open(os.path.join(index_dir, 'meta.json'), 'w') as f:
+        json.dump({'num_files': len(file_info)}, f)
+
 def generate_worker_disk_usage():
     print("Generating worker_disk_usage.csv...")
     rows = []
@@ -966,7 +1591,7 @@ def generate_worker_disk_usage():
         worker_disk_usage_df['disk_usage_accumulation(%)'] = worker_disk_usage_df['disk_usage_accumulation(MB)'] / worker_disk_usage_df['worker_hash'].map(lambda x: worker_info[x]['disk(MB)'])
         worker_disk_usage_df.drop('positive_size(MB)', axis=1, inplace=True)
 
-        worker_disk_usage_df.to_csv(os.path.join(dirname, 'worker_disk_usage.csv'), index=False)
+        write_table(worker_disk_usage_df, 'worker_disk_usage.csv')
 
     return worker_disk_usage_df
 
@@ -976,26 +1601,52 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('log_dir', type=str, help='the target log directory')
     parser.add_argument('--execution-details-only', action='store_true', help='Only generate data for task execution details')
+    parser.add_argument('--parallel-debug', action='store_true', help='Scan chunks of the debug log with multiple processes')
+    parser.add_argument('--cores', type=int, default=cpu_count(), help='The number of processes that scan the debug log with --parallel-debug')
+    parser.add_argument('--profile-parsers', action='store_true', help='Report hits and time of each debug line handler')
+    parser.add_argument('--format', type=str, default='csv', choices=['csv', 'parquet', 'feather'], help='The format of the generated tables')
+    parser.add_argument('--concurrency-breakdown', action='store_true', help='Add per-category and per-worker concurrent task counts to task_concurrency')
+    parser.add_argument('--follow', action='store_true', help='Parse only what was appended to the logs since the last --follow run, for logs of a running manager')
     args = parser.parse_args()
 
+    output_format = args.format
+    concurrency_breakdown = args.concurrency_breakdown
+    num_cores = max(args.cores, 1)
+
     dirname = os.path.join(args.log_dir, 'vine-logs')
     txn = os.path.join(dirname, 'transactions')
     debug = os.path.join(dirname, 'debug')
     taskgraph = os.path.join(dirname, 'taskgraph')
     daskvine_log = os.path.join(dirname, 'daskvine.log')
 
+    follow_logs = args.follow
+    if follow_logs:
+        load_checkpoint()
+
     parse_txn()
 
     if not args.execution_details_only:
         parse_taskgraph()
-        parse_debug()
+        parse_debug(parallel=args.parallel_debug, profile=args.profile_parsers)
 
     parse_daskvine_log()
 
+    # the steps below change the parsed state, so it is saved before them
+    if follow_logs:
+        save_checkpoint()
+
+    if not args.execution_details_only:
+        finalize_taskgraph()
+        finalize_debug()
+
+    finalize_daskvine_log()
+
     task_df = generate_task_df()
     worker_disk_usage_df  = generate_worker_disk_usage()
     worker_summary_df = generate_worker_summary(worker_disk_usage_df)
+    generate_worker_core_occupancy()
     generate_other_statistics(task_df, worker_summary_df)
+    generate_filename_index()
 
     # for function calls
     generate_library_summary()
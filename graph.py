@@ -1,147 +1,274 @@
 import pandas as pd
+import numpy as np
 import os
+import gc
+import itertools
+import bisect
 import tqdm
 import ast
 import graphviz
 import argparse
-from collections import deque
 from multiprocessing import Pool, cpu_count, set_start_method
 
 
+TABLE_FORMATS = ['csv', 'parquet', 'feather']
+# the most subgraph ids sent to a pool worker at once
+SUBGRAPH_CHUNK_SIZE = 64
+
 def safe_literal_eval(val):
     try:
         return ast.literal_eval(val)
     except (ValueError, SyntaxError):
         return []
 
-class EdgeNode:
-    def __init__(self, tail, head, weight=None, tail_link=None, head_link=None):
-        self.tail = tail
-        self.head = head
-        self.weight = weight
-        self.tail_link = tail_link
-        self.head_link = head_link
-
-class VertexNode:
-    def __init__(self, task_id):
-        self.task_id = task_id
-        self.first_in = None
-        self.first_out = None
-        self.task_life_time = 0
-
-class OrthogonalListGraph:
+def arrow_table_to_df(table):
+    import pyarrow as pa
+    df = table.to_pandas()
+    # list columns come as numpy arrays from to_pandas, convert them to python lists
+    for name, column in zip(table.column_names, table.columns):
+        if pa.types.is_list(column.type):
+            df[name] = column.to_pylist()
+    return df
+
+def find_table(csv_filename):
+    # the tables can also be generated in a columnar format, use the most recent one that exists
+    base = os.path.join(dirname, os.path.splitext(csv_filename)[0])
+    paths = [f"{base}.{table_format}" for table_format in TABLE_FORMATS if os.path.exists(f"{base}.{table_format}")]
+    if not paths:
+        raise FileNotFoundError(f"{csv_filename} not found in {dirname}")
+    return max(paths, key=os.path.getmtime)
+
+def read_table(path, list_columns=[]):
+    # pyarrow is only needed for the columnar formats
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return arrow_table_to_df(pq.read_table(path))
+    if path.endswith('.feather'):
+        import pyarrow.feather as feather
+        return arrow_table_to_df(feather.read_table(path))
+    # list columns are stored as python reprs in csv
+    df = pd.read_csv(path)
+    for col in list_columns:
+        df[col] = df[col].apply(safe_literal_eval)
+    return df
+
+def write_table(df, csv_filename, table_format, index=False):
+    if index:
+        df = df.reset_index()
+    if table_format == 'csv':
+        df.to_csv(os.path.join(dirname, csv_filename), index=False)
+        return
+    filename = os.path.splitext(csv_filename)[0] + '.' + table_format
+    if table_format == 'parquet':
+        df.to_parquet(os.path.join(dirname, filename), index=False)
+    elif table_format == 'feather':
+        df.reset_index(drop=True).to_feather(os.path.join(dirname, filename))
+
+class CSRGraph:
+    # the task graph in numpy arrays, vertex i is the task task_ids[i]
+    # the out-edges of vertex i are out_heads[out_offsets[i]:out_offsets[i + 1]] with out_weights, the in-edges are
+    # in_tails[in_offsets[i]:in_offsets[i + 1]], both newest edge first, which is about 16 bytes per edge
+    # the pool workers inherit it by fork, reading it touches no python objects so the pages stay shared
     def __init__(self):
-        self.vertices = {}
-        self.edges = {}
+        self.task_ids = np.zeros(0, dtype=np.int64)
+        self.task_life_times = np.zeros(0, dtype=np.float64)
+        self.sorter = np.zeros(0, dtype=np.int64)
+        # edges are collected as (tail, head, weight) task ids until build() lays them out
+        self.edge_tails, self.edge_heads, self.edge_weights = [], [], []
+        self.built = False
         self.subgraphs = []
 
     def get_num_of_subgraphs(self):
         return len(self.subgraphs)
 
-    def add_vertex(self, task_id, task_life_time=0):
-        if task_id not in self.vertices:
-            self.vertices[task_id] = VertexNode(task_id)
-            self.vertices[task_id].task_life_time = task_life_time
-        else:
+    def unbuild(self):
+        if self.built:
+            # the built edges come back as the oldest ones, the out-edges of each task keep their order
+            self.edge_tails.insert(0, np.repeat(self.task_ids, np.diff(self.out_offsets))[::-1])
+            self.edge_heads.insert(0, self.task_ids[self.out_heads][::-1])
+            self.edge_weights.insert(0, self.out_weights[::-1])
+            self.built = False
+
+    def add_vertices(self, task_ids, task_life_times):
+        self.unbuild()
+        task_ids = np.asarray(task_ids, dtype=np.int64)
+        task_life_times = np.asarray(task_life_times, dtype=np.float64)
+        # keep the first of the vertices that are added twice
+        all_task_ids = np.concatenate([self.task_ids, task_ids])
+        _, first = np.unique(all_task_ids, return_index=True)
+        is_first = np.zeros(len(all_task_ids), dtype=bool)
+        is_first[first] = True
+        for task_id in all_task_ids[~is_first].tolist():
             print(f"Warning: Task {task_id} already exists.")
+        self.task_ids = all_task_ids[is_first]
+        self.task_life_times = np.concatenate([self.task_life_times, task_life_times])[is_first]
+        self.sorter = np.argsort(self.task_ids, kind='stable')
+
+    def add_vertex(self, task_id, task_life_time=0):
+        self.add_vertices([task_id], [task_life_time])
+
+    def add_edges(self, tails, heads, weights):
+        self.unbuild()
+        self.edge_tails.append(np.asarray(tails, dtype=np.int64))
+        self.edge_heads.append(np.asarray(heads, dtype=np.int64))
+        self.edge_weights.append(np.asarray(weights, dtype=np.float64))
 
     def add_edge(self, tail, head, weight):
-        if (tail, head) in self.edges:
-            return 
-        new_edge = EdgeNode(tail, head, weight)
-        
-        if tail in self.vertices:
-            new_edge.tail_link = self.vertices[tail].first_out
-            self.vertices[tail].first_out = new_edge
-        if head in self.vertices:
-            new_edge.head_link = self.vertices[head].first_in
-            self.vertices[head].first_in = new_edge
+        self.add_edges([tail], [head], [weight])
 
-        self.edges[(tail, head)] = new_edge
+    def index_of(self, task_ids):
+        task_ids = np.asarray(task_ids, dtype=np.int64)
+        positions = np.searchsorted(self.task_ids, task_ids, sorter=self.sorter)
+        return self.sorter[np.minimum(positions, max(len(self.task_ids) - 1, 0))] if len(self.task_ids) else positions
+
+    def build(self):
+        if self.built:
+            return
+        num_vertices = len(self.task_ids)
+        index_dtype = np.int32 if num_vertices < 2**31 else np.int64
+        tails = np.concatenate(self.edge_tails) if self.edge_tails else np.zeros(0, dtype=np.int64)
+        heads = np.concatenate(self.edge_heads) if self.edge_heads else np.zeros(0, dtype=np.int64)
+        weights = np.concatenate(self.edge_weights) if self.edge_weights else np.zeros(0, dtype=np.float64)
+        self.edge_tails, self.edge_heads, self.edge_weights = [], [], []
+
+        # the first edge added between two tasks is kept, edges to tasks that are not vertices are dropped
+        tail_ids, head_ids = self.index_of(tails), self.index_of(heads)
+        known = (self.task_ids[tail_ids] == tails) & (self.task_ids[head_ids] == heads) if num_vertices else np.zeros(len(tails), dtype=bool)
+        # unknown task ids are clipped onto real vertices by index_of, so they are dropped before the dedup
+        known_edges = np.flatnonzero(known)
+        _, first = np.unique(tail_ids[known_edges].astype(np.int64) * max(num_vertices, 1) + head_ids[known_edges], return_index=True)
+        # newest first, as each new edge used to be put at the front of its lists
+        edges = np.sort(known_edges[first])[::-1]
+        tail_ids, head_ids, weights = tail_ids[edges], head_ids[edges], weights[edges]
+
+        out_order = np.argsort(tail_ids, kind='stable')
+        self.out_offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tail_ids, minlength=num_vertices), out=self.out_offsets[1:])
+        self.out_heads = head_ids[out_order].astype(index_dtype)
+        self.out_weights = weights[out_order]
+
+        in_order = np.argsort(head_ids, kind='stable')
+        self.in_offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(head_ids, minlength=num_vertices), out=self.in_offsets[1:])
+        self.in_tails = tail_ids[in_order].astype(index_dtype)
+        self.built = True
+
+    def out_edges(self, v):
+        start, end = self.out_offsets[v], self.out_offsets[v + 1]
+        return list(zip(self.out_heads[start:end].tolist(), self.out_weights[start:end].tolist()))
+
+    def in_edges(self, v):
+        return self.in_tails[self.in_offsets[v]:self.in_offsets[v + 1]].tolist()
 
     def display(self):
-        for v in self.vertices.values():
-            print(f"Vertex {v.task_id}:")
-            out_edge = v.first_out
-            while out_edge:
-                print(f"  Out to {out_edge.head}")
-                out_edge = out_edge.tail_link
-            in_edge = v.first_in
-            while in_edge:
-                print(f"  In from {in_edge.tail}")
-                in_edge = in_edge.head_link
+        self.build()
+        task_ids = self.task_ids.tolist()
+        for v, task_id in enumerate(task_ids):
+            print(f"Vertex {task_id}:")
+            for head, _ in self.out_edges(v):
+                print(f"  Out to {task_ids[head]}")
+            for tail in self.in_edges(v):
+                print(f"  In from {task_ids[tail]}")
 
     def update_subgraphs(self):
-        visited = set()
-        self.subgraphs = []
-
-        def dfs(v, subgraph):
-            visited.add(v)
-            subgraph.append(v)
-            edge = self.vertices[v].first_out
-            while edge:
-                if edge.head not in visited:
-                    dfs(edge.head, subgraph)
-                edge = edge.tail_link
-            edge = self.vertices[v].first_in
-            while edge:
-                if edge.tail not in visited:
-                    dfs(edge.tail, subgraph)
-                edge = edge.head_link
-
-        for vertex in self.vertices:
-            if vertex not in visited:
-                subgraph = []
-                dfs(vertex, subgraph)
-                self.subgraphs.append(subgraph)
+        self.build()
+        num_vertices = len(self.task_ids)
+        # weakly connected components by union-find over the edge arrays, each edge that spans two trees hooks the
+        # larger root under the smaller one, then the trees are flattened by pointer jumping
+        parent = np.arange(num_vertices)
+        tails = np.repeat(np.arange(num_vertices), np.diff(self.out_offsets))
+        heads = self.out_heads.astype(np.int64)
+        while len(tails):
+            tail_roots, head_roots = parent[tails], parent[heads]
+            spanning = tail_roots != head_roots
+            # an edge inside a tree stays inside it
+            tails, heads = tails[spanning], heads[spanning]
+            if not len(tails):
+                break
+            tail_roots, head_roots = tail_roots[spanning], head_roots[spanning]
+            np.minimum.at(parent, np.maximum(tail_roots, head_roots), np.minimum(tail_roots, head_roots))
+            while True:
+                grandparent = parent[parent]
+                if np.array_equal(grandparent, parent):
+                    break
+                parent = grandparent
+
+        # a root is the first vertex of its subgraph, so the subgraphs are numbered in the order of the tasks
+        _, self.subgraph_ids = np.unique(parent, return_inverse=True)
+        self.subgraph_ids = self.subgraph_ids.reshape(-1)
+        # the vertices of subgraph k are subgraph_vertices[subgraph_offsets[k]:subgraph_offsets[k + 1]]
+        self.subgraph_vertices = np.argsort(self.subgraph_ids, kind='stable')
+        num_subgraphs = self.subgraph_ids.max() + 1 if num_vertices else 0
+        self.subgraph_offsets = np.zeros(num_subgraphs + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.subgraph_ids, minlength=num_subgraphs), out=self.subgraph_offsets[1:])
+        self.subgraphs = [self.subgraph(k) for k in range(num_subgraphs)]
+
+    def subgraph(self, k):
+        return self.task_ids[self.subgraph_vertices[self.subgraph_offsets[k]:self.subgraph_offsets[k + 1]]].tolist()
+
+    def edges_of(self, vertices):
+        # the positions in the out-edge arrays of the out-edges of the given vertices
+        starts = self.out_offsets[vertices]
+        counts = self.out_offsets[vertices + 1] - starts
+        return np.arange(counts.sum()) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+
+    def update_critical_paths(self):
+        # one topological pass over the whole graph, level by level: a task finishes its execution time after the
+        # latest of its parents' finish plus the edge weight, or at 0, then the latest finish times are pushed back
+        # through the levels in reverse, with every subgraph ending at the latest earliest finish among its tasks
+        num_vertices = len(self.task_ids)
+        tails = np.repeat(np.arange(num_vertices), np.diff(self.out_offsets))
+        heads = self.out_heads.astype(np.int64)
+        remaining_parents = np.bincount(heads, minlength=num_vertices)
+        ready_time = np.zeros(num_vertices)
+        self.earliest_finish = np.full(num_vertices, np.nan)
+        levels = []
+        level = np.flatnonzero(remaining_parents == 0)
+        while len(level):
+            levels.append(level)
+            self.earliest_finish[level] = ready_time[level] + self.task_life_times[level]
+            edges = self.edges_of(level)
+            np.maximum.at(ready_time, heads[edges], self.earliest_finish[tails[edges]] + self.out_weights[edges])
+            np.subtract.at(remaining_parents, heads[edges], 1)
+            level = np.unique(heads[edges][remaining_parents[heads[edges]] == 0])
+        # the tasks on a cycle are never reached and have no finish times
+
+        num_subgraphs = len(self.subgraph_offsets) - 1
+        subgraph_end = np.full(num_subgraphs, -np.inf)
+        np.fmax.at(subgraph_end, self.subgraph_ids, self.earliest_finish)
+        self.latest_finish = subgraph_end[self.subgraph_ids]
+        for level in reversed(levels):
+            edges = self.edges_of(level)
+            np.minimum.at(self.latest_finish, tails[edges], self.latest_finish[heads[edges]] - self.task_life_times[heads[edges]] - self.out_weights[edges])
+        self.latest_finish[np.isnan(self.earliest_finish)] = np.nan
+        self.slack = self.latest_finish - self.earliest_finish
+
+        # the critical parent of a task is its first parent that set its ready time
+        finish_through = self.earliest_finish[tails] + self.out_weights
+        is_critical_edge = (finish_through == ready_time[heads]) & (finish_through > 0)
+        predecessor = np.full(num_vertices, -1)
+        critical_edges = np.flatnonzero(is_critical_edge)[::-1]
+        predecessor[heads[critical_edges]] = tails[critical_edges]
+
+        # each critical path ends at the first task with the latest earliest finish of its subgraph
+        earliest_finish = np.where(np.isnan(self.earliest_finish), -np.inf, self.earliest_finish)
+        order = np.lexsort((np.arange(num_vertices), -earliest_finish, self.subgraph_ids))
+        ends = order[self.subgraph_offsets[:-1]].tolist()
+        predecessor = predecessor.tolist()
+        task_ids = self.task_ids.tolist()
+        self.critical_paths = []
+        for end in ends:
+            critical_path = []
+            cur = end
+            while cur >= 0:
+                critical_path.append(task_ids[cur])
+                cur = predecessor[cur]
+            critical_path.reverse()
+            self.critical_paths.append(critical_path)
 
     def find_critical_path_in_subgraph(self, subgraph):
-        in_degree = {v: 0 for v in subgraph}
-        longest_path = {v: 0 for v in subgraph}
-        predecessor = {v: None for v in subgraph}
-
-        # Calculate in-degrees
-        for v in subgraph:
-            vertex = self.vertices[v]
-            edge = vertex.first_out
-            while edge:
-                if edge.head in subgraph:
-                    in_degree[edge.head] += 1
-                edge = edge.tail_link
-
-        # Initialize queue with vertices having zero in-degree
-        queue = deque([v for v in subgraph if in_degree[v] == 0])
-        
-        # Topological order and longest path calculation
-        topo_order = []
-        while queue:
-            v = queue.popleft()
-            topo_order.append(v)
-            edge = self.vertices[v].first_out
-            while edge:
-                if edge.head in subgraph:
-                    if longest_path[edge.head] < longest_path[v] + self.vertices[edge.head].task_life_time + edge.weight:
-                        longest_path[edge.head] = longest_path[v] + self.vertices[edge.head].task_life_time + edge.weight
-                        predecessor[edge.head] = v
-                    in_degree[edge.head] -= 1
-                    if in_degree[edge.head] == 0:
-                        queue.append(edge.head)
-                edge = edge.tail_link
-
-        # Find the maximum length and construct the critical path
-        max_len = max(longest_path.values())
-        critical_path = []
-        for v in longest_path:
-            if longest_path[v] == max_len:
-                cur = v
-                while cur is not None:
-                    critical_path.append(cur)
-                    cur = predecessor[cur]
-                break
+        return self.critical_paths[self.subgraph_ids[self.index_of([subgraph[0]])[0]]]
 
-        critical_path.reverse()
-        return critical_path
-    
     def plot_subgraph(self, subgraph, view=False, save_to=None):
         if not save_to:
             print("Error: save_to is not provided.")
@@ -162,41 +289,33 @@ class OrthogonalListGraph:
             else:
                 dot.node(str(task_id), task_node_label, shape='ellipse')
 
+            # the vertices are the rows of task_done
+            v = self.index_of([task_id])[0]
             if args.no_files:
                 # plot edges from this task to its successors
-                edge = self.vertices[task_id].first_out
-                while edge:
-                    edge_label = f"{edge.weight}s" if not args.no_weight else None
-                    dot.edge(str(task_id), str(edge.head), label=edge_label)
-                    edge = edge.tail_link
+                for head, weight in self.out_edges(v):
+                    edge_label = f"{weight}s" if not args.no_weight else None
+                    dot.edge(str(task_id), str(int(self.task_ids[head])), label=edge_label)
             else:
                 # plot edges from input files to this task
-                for input_file in task_info[task_id]['input_files']:
-                    file = file_info_df[file_info_df['filename'] == input_file].iloc[0]
-                    actual_producer_task_id = 0
-                    actual_producer_task = None
-                    for producer_task_id in file['producers']:
-                        # the producers are already sorted by time
-                        producer_task = task_info[producer_task_id]
-                        if float(producer_task[task_finish_timestamp]) <= float(this_task[task_start_timestamp]):
-                            actual_producer_task_id = producer_task_id
-                            actual_producer_task = producer_task
-                    if actual_producer_task is None:
+                for input_file in this_task['input_files']:
+                    # the actual producer is the last one that finished before this task started
+                    finish_times, producers = producer_index.get(input_file, ([], []))
+                    i = bisect.bisect_right(finish_times, task_time_start[v]) - 1
+                    if i < 0:
                         print(f"Warning: Task {task_id} has no producer task for input file {input_file}.")
-                    time_period = round(float(this_task[task_start_timestamp]) - float(actual_producer_task[task_finish_timestamp]), 4)
-                    edge_label = f"{time_period}s" if not args.no_weight else None
-                    if time_period < 0:
-                        # it means that this input file is lost after this task is done and it is used as another task's input file                        
-                        print(f"Warning: Task {task_id} is started before its producer task {actual_producer_task_id} is finished.")
                         continue
+                    actual_producer_task = task_info[int(self.task_ids[producers[i]])]
+                    time_period = edge_weights(producers[i], v)
+                    edge_label = f"{time_period}s" if not args.no_weight else None
                     dot.node(input_file, input_file, shape='box')
                     if this_task['is_recovery_task'] or actual_producer_task['is_recovery_task']:
                         dot.edge(input_file, str(task_id), color='#ea67a9', style='dashed', label=edge_label)
                     else:
                         dot.edge(input_file, str(task_id), label=edge_label)
                 # plot edges from this task to output files
-                for output_file in task_info[task_id]['output_files']:
-                    time_period = round(float(this_task[task_finish_timestamp]) - float(this_task[task_start_timestamp]), 4)
+                for output_file in this_task['output_files']:
+                    time_period = self.task_life_times[v]
                     edge_label = f"{time_period}s" if not args.no_weight else None
                     dot.node(output_file, output_file, shape='box')
                     if this_task['is_recovery_task']:
@@ -211,13 +330,11 @@ class OrthogonalListGraph:
             dot.render(save_to, format='png', view=view)
 
 
-def process_subgraph(args):
-    graph, subgraph, graph_id = args
+def process_subgraph(graph_id):
+    # csr_graph is inherited from the parent process
+    subgraph = csr_graph.subgraph(graph_id - 1)
 
-    for task_id in subgraph:
-        task_info[task_id]['graph_id'] = graph_id
-
-    graph.plot_subgraph(subgraph, save_to=os.path.join(dirname, f"subgraph_{graph_id}"), view=False)
+    csr_graph.plot_subgraph(subgraph, save_to=os.path.join(dirname, f"subgraph_{graph_id}"), view=False)
     root = subgraph[0]
     graph_info = {
         'graph_id': graph_id,
@@ -230,7 +347,7 @@ def process_subgraph(args):
         'time_completion': 0,
         'tasks': subgraph,
     }
-    graph_info['critical_tasks'] = graph.find_critical_path_in_subgraph(subgraph)
+    graph_info['critical_tasks'] = csr_graph.find_critical_path_in_subgraph(subgraph)
     graph_info['num_critical_tasks'] = len(graph_info['critical_tasks'])
     first_task_id = graph_info['critical_tasks'][0]
     last_task_id = graph_info['critical_tasks'][-1]
@@ -241,41 +358,77 @@ def process_subgraph(args):
     return root, graph_info
 
 def generate_subgraphs(graph):
-    print(f"Processing subgraphs with {cpu_count()} cores...")
+    global csr_graph
+    print(f"Processing subgraphs with {args.cores} cores...")
+
+    # the workers are forked with the graph in place, so only the subgraph ids are sent to them
+    csr_graph = graph
+    num_subgraphs = csr_graph.get_num_of_subgraphs()
+    chunk_size = max(1, min(SUBGRAPH_CHUNK_SIZE, num_subgraphs // (args.cores * 4)))
+    # keep the collector of the workers away from the objects of the parent, which would unshare their pages
+    gc.freeze()
 
     graph_info = {}
-    pbar = tqdm.tqdm(total=len(graph.subgraphs))
-    with Pool(cpu_count()) as pool:
-        results = pool.imap_unordered(process_subgraph, [(graph, subgraph, i + 1) for i, subgraph in enumerate(graph.subgraphs)])
+    pbar = tqdm.tqdm(total=num_subgraphs)
+    with Pool(args.cores) as pool:
+        results = pool.imap_unordered(process_subgraph, range(1, num_subgraphs + 1), chunksize=chunk_size)
         for root, info in results:
             graph_info[root] = info
             pbar.update(1)
     pbar.close()
+    gc.unfreeze()
 
     return graph_info
 
 
+def explode_files(column):
+    # one (file, task position) row per file of each task, in order
+    file_lists = task_done_df[column].tolist()
+    counts = np.fromiter(map(len, file_lists), dtype=np.int64, count=len(file_lists))
+    return pd.DataFrame({'file': list(itertools.chain.from_iterable(file_lists)), 'task': np.repeat(np.arange(len(file_lists)), counts)})
+
+def edge_weights(tails, heads):
+    # the time from the end of each tail task to the start of its head task, by row of task_done
+    return np.round(task_time_start[heads] - task_time_finish[tails], 4)
+
+def index_producers():
+    # filename -> (finish times, task_done rows) of its producers, sorted by finish time, for a bisect on the start
+    # time of a consumer, producers that finished at the same time keep their order
+    producer_lists = file_info_df['producers'].tolist()
+    counts = np.fromiter(map(len, producer_lists), dtype=np.int64, count=len(producer_lists))
+    files = np.repeat(np.arange(len(producer_lists)), counts)
+    rows = pd.Index(task_done_df['task_id']).get_indexer(list(itertools.chain.from_iterable(producer_lists)))
+    files, rows = files[rows >= 0], rows[rows >= 0]
+    order = np.lexsort((task_time_finish[rows], files))
+    files, rows = files[order], rows[order]
+    finish_times, rows_list = task_time_finish[rows].tolist(), rows.tolist()
+    bounds = np.searchsorted(files, np.arange(len(producer_lists) + 1)).tolist()
+    producer_index = {}
+    for k, filename in enumerate(file_info_df['filename'].tolist()):
+        # the first row of a file wins
+        if filename not in producer_index:
+            producer_index[filename] = (finish_times[bounds[k]:bounds[k + 1]], rows_list[bounds[k]:bounds[k + 1]])
+    return producer_index
+
 def generate_graph():
     print("Generating graph...")
-    graph = OrthogonalListGraph()
-    input_to_tasks = {}
-
-    for task_id, task in task_info.items():
-        execution_time = round(float(task[task_finish_timestamp]) - float(task[task_start_timestamp]), 4)
-        graph.add_vertex(task_id, execution_time)
-        for file in task['input_files']:
-            input_to_tasks.setdefault(file, []).append(task_id)
-
-    for task_id, task in task_info.items():
-        for file in task['output_files']:
-            if file in input_to_tasks:
-                tail_task = task
-                for target_task_id in input_to_tasks[file]:
-                    head_task = task_info[target_task_id]
-                    weight = round(float(head_task[task_start_timestamp]) - float(tail_task[task_finish_timestamp]), 4)
-                    graph.add_edge(task_id, target_task_id, weight=weight)
+    graph = CSRGraph()
+
+    task_ids = task_done_df['task_id'].to_numpy(dtype=np.int64)
+    graph.add_vertices(task_ids, np.round(task_time_finish - task_time_start, 4))
+
+    # an edge goes from each task to every task that has one of its output files as an input file, in the order
+    # of the tasks and of their files
+    outputs = explode_files('output_files').rename(columns={'task': 'tail'})
+    inputs = explode_files('input_files').rename(columns={'task': 'head'})
+    outputs['output_order'] = np.arange(len(outputs))
+    inputs['input_order'] = np.arange(len(inputs))
+    edges = outputs.merge(inputs, on='file').sort_values(['output_order', 'input_order'])
+    tails, heads = edges['tail'].to_numpy(), edges['head'].to_numpy()
+    graph.add_edges(task_ids[tails], task_ids[heads], edge_weights(tails, heads))
 
     graph.update_subgraphs()
+    graph.update_critical_paths()
 
     return graph
 
@@ -289,7 +442,9 @@ if __name__ == '__main__':
     parser.add_argument('--no-weight', action='store_true')
     parser.add_argument('--task-node-label', type=str, default='task-id')
     parser.add_argument('--save-format', type=str, default='svg')
+    parser.add_argument('--cores', type=int, default=cpu_count(), help='the number of processes that plot the subgraphs')
     args = parser.parse_args()
+    args.cores = max(args.cores, 1)
 
     task_start_timestamp = 'time_worker_start'
     task_finish_timestamp = 'time_worker_end'
@@ -297,27 +452,30 @@ if __name__ == '__main__':
     logs_dir = os.path.join(os.getcwd(), 'logs')
     dirname = os.path.join(args.log_dir, 'vine-logs')
 
-    task_done_df = pd.read_csv(os.path.join(dirname, 'task_done.csv'))
-    task_done_df['input_files'] = task_done_df['input_files'].apply(safe_literal_eval)
-    task_done_df['output_files'] = task_done_df['output_files'].apply(safe_literal_eval)
+    # the results are written in the same format as task_done
+    task_done_path = find_table('task_done.csv')
+    table_format = os.path.splitext(task_done_path)[1][1:]
+    task_done_df = read_table(task_done_path, ['input_files', 'output_files'])
     task_info = task_done_df.set_index('task_id', inplace=False).to_dict('index')
+    task_time_start = task_done_df[task_start_timestamp].to_numpy(dtype=np.float64)
+    task_time_finish = task_done_df[task_finish_timestamp].to_numpy(dtype=np.float64)
+
+    file_info_df = read_table(find_table('file_info.csv'), ['producers', 'consumers'])
+    producer_index = index_producers()
 
-    file_info_df = pd.read_csv(os.path.join(dirname, 'file_info.csv'))
-    file_info_df['producers'] = file_info_df['producers'].apply(safe_literal_eval)
-    file_info_df['consumers'] = file_info_df['consumers'].apply(safe_literal_eval)
-    
     graph = generate_graph()
     graph_info = generate_subgraphs(graph)
 
     # update graph_id for each task
-    for i, subgraph in enumerate(graph.subgraphs):
-        for task_id in subgraph:
-            task_info[task_id]['graph_id'] = i + 1
+    vertices = graph.index_of(task_done_df['task_id'])
+    task_done_df['graph_id'] = graph.subgraph_ids[vertices] + 1
+    # the finish times are counted from the start of the subgraph, a task with no slack is on a critical path
+    task_done_df['earliest_finish(s)'] = np.round(graph.earliest_finish[vertices], 4)
+    task_done_df['latest_finish(s)'] = np.round(graph.latest_finish[vertices], 4)
+    # adding 0.0 turns the -0.0 left by rounding tiny negative slack into 0.0
+    task_done_df['slack(s)'] = np.round(graph.slack[vertices], 4) + 0.0
 
     graph_info_df = pd.DataFrame.from_dict(graph_info, orient='index')
     graph_info_df.sort_values(by='graph_id', inplace=True)
-    graph_info_df.to_csv(os.path.join(dirname, 'graph_info.csv'), index=False)
-    task_done_df = pd.DataFrame.from_dict(task_info, orient='index')
-
-    task_done_df.index.name = 'task_id'
-    task_done_df.to_csv(os.path.join(dirname, 'task_done.csv'), index=True)
+    write_table(graph_info_df, 'graph_info.csv', table_format)
+    write_table(task_done_df, 'task_done.csv', table_format)
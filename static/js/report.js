@@ -21,10 +21,8 @@ window.addEventListener('load', function() {
 
         window.managerInfo = await fetchCSVData("manager_info.csv");
         window.taskDone = await fetchCSVData("task_done.csv");
-        window.taskConcurrency = await fetchCSVData("task_concurrency.csv");
         window.taskFailedOnManager = await fetchCSVData("task_failed_on_manager.csv");
         window.taskFailedOnWorker = await fetchCSVData("task_failed_on_worker.csv");
-        window.workerDiskUpdate = await fetchCSVData("worker_disk_usage.csv");
         window.workerConcurrency = await fetchCSVData("worker_concurrency.csv");
         window.workerSummary = await fetchCSVData("worker_summary.csv");
         window.fileInfo = await fetchCSVData("file_info.csv");
@@ -14,18 +14,28 @@ var dotRadius = lineStrokeWidth;
 const dotColor = 'steelblue';
 const tooltip = document.getElementById('vine-tooltip');
 
-function plotTasksConcurrency() {
-    svgElement.selectAll('*').remove();
+async function fetchTasksConcurrency(width) {
+    // at most four points per pixel column, downsampled by the server
+    const response = await axios.get('downsample', {
+        params: {
+            log_name: window.logName,
+            series: 'task_concurrency',
+            t0: window.minTime,
+            t1: window.maxTime,
+            width: Math.max(Math.ceil(width), 1)
+        }
+    });
+    return response.data.time.map((time, i) => ({ time: time, concurrent_tasks: response.data.value[i] }));
+}
 
+async function plotTasksConcurrency() {
     const margin = {top: 20, right: 20, bottom: 40, left: 60};
     const svgWidth = svgContainer.clientWidth - margin.left - margin.right;
     const svgHeight = svgContainer.clientHeight - margin.top - margin.bottom;
-    
-    var taskConcurrency = window.taskConcurrency;
-    taskConcurrency.forEach(function(d) {
-        d.time = +d.time;
-        d.concurrent_tasks = +d.concurrent_tasks;
-    });
+
+    var taskConcurrency = await fetchTasksConcurrency(svgWidth);
+
+    svgElement.selectAll('*').remove();
 
     const maxConcurrentTasks = d3.max(taskConcurrency, d => d.concurrent_tasks);
 
@@ -40,10 +40,22 @@ export async function fetchCSVData(csvFilename) {
         const response = await axios.get(`get_csv_data`, {
             params: {
                 log_name: logName,
-                csv_filename: csvFilename
+                csv_filename: csvFilename,
+                orient: 'columns'
             }
         });
-        return response.data;
+        // the table is sent as one array per column, rebuild the row objects
+        const { columns, data } = response.data;
+        const numRows = columns.length > 0 ? data[columns[0]].length : 0;
+        const rows = new Array(numRows);
+        for (let i = 0; i < numRows; i++) {
+            const row = {};
+            for (const column of columns) {
+                row[column] = data[column][i];
+            }
+            rows[i] = row;
+        }
+        return rows;
 
     } catch (error) {
         console.error('Error:', error);
@@ -205,5 +217,8 @@ export function getTaskInnerHTML(taskData) {
         htmlContent += `When DaskVine Submitted: ${taskData.when_submitted_by_daskvine - window.time_manager_start}s<br>
                         When DaskVine Received: ${taskData.when_received_by_daskvine - window.time_manager_start}s<br>`;
     }
+    if ('slack(s)' in taskData && Number.isFinite(+taskData['slack(s)'])) {
+        htmlContent += `Slack: ${(+taskData['slack(s)']).toFixed(precision)}s<br>`;
+    }
     return htmlContent;
 }
\ No newline at end of file
@@ -11,30 +11,47 @@ const svgContainer = document.getElementById('worker-disk-usage-container');
 
 const tooltip = document.getElementById('vine-tooltip');
 
-export function plotWorkerDiskUsage({ displayDiskUsageByPercentage = false, highlightWorkerID = null, displayAccumulationOnly = false } = {}) {
-    // first remove all the elements in the svg
-    svgElement.selectAll('*').remove();
+async function fetchWorkerDiskUsage(column, width) {
+    // one series per worker, at most four points per pixel column, downsampled by the server
+    const workerIDs = window.workerSummary.map(d => +d.worker_id);
+    const responses = await Promise.all(workerIDs.map(workerID => axios.get('downsample', {
+        params: {
+            log_name: window.logName,
+            series: 'worker_disk_usage',
+            worker_id: workerID,
+            column: column,
+            t0: window.minTime,
+            t1: window.maxTime,
+            width: Math.max(Math.ceil(width), 1)
+        }
+    })));
+    return new Map(workerIDs.map((workerID, i) => [workerID, responses[i].data.time.map((time, j) => ({
+        worker_id: workerID,
+        when_stage_in_or_out: time,
+        disk_usage: responses[i].data.value[j],
+    }))]));
+}
 
-    const groupedworkerDiskUpdate = d3.group(window.workerDiskUpdate, d => d.worker_id);
-    
-    // get the window.minTime, window.maxTime and maxDiskUsage
+export async function plotWorkerDiskUsage({ displayDiskUsageByPercentage = false, highlightWorkerID = null, displayAccumulationOnly = false } = {}) {
     let columnNameMB = 'disk_usage(MB)';
     let columnNamePercentage = 'disk_usage(%)';
     if (displayAccumulationOnly) {
         columnNameMB = 'disk_usage_accumulation(MB)';
         columnNamePercentage = 'disk_usage_accumulation(%)';
     }
-    let maxDiskUsage;
-    if (displayDiskUsageByPercentage) {
-        maxDiskUsage = d3.max(window.workerDiskUpdate, function(d) { return +d[columnNamePercentage]; });
-    } else {
-        maxDiskUsage = d3.max(window.workerDiskUpdate, function(d) { return +d[columnNameMB]; });
-    }
 
     const margin = {top: 20, right: 20, bottom: 40, left: 60};
     const svgWidth = svgContainer.clientWidth - margin.left - margin.right;
     const svgHeight = svgContainer.clientHeight - margin.top - margin.bottom;
 
+    const groupedworkerDiskUpdate = await fetchWorkerDiskUsage(displayDiskUsageByPercentage ? columnNamePercentage : columnNameMB, svgWidth);
+
+    // first remove all the elements in the svg
+    svgElement.selectAll('*').remove();
+
+    // the minimum and maximum of each pixel column are kept, so is the maximum disk usage
+    const maxDiskUsage = d3.max(Array.from(groupedworkerDiskUpdate.values()), points => d3.max(points, d => d.disk_usage));
+
     const svg = svgElement
         .attr('viewBox', `0 0 ${svgContainer.clientWidth} ${svgContainer.clientHeight}`)
         .attr('preserveAspectRatio', 'xMidYMid meet')
@@ -88,13 +105,10 @@ export function plotWorkerDiskUsage({ displayDiskUsageByPercentage = false, high
             return xScale(d.when_stage_in_or_out - window.minTime);
         })
         .y(d => {
-            const diskUsage = displayDiskUsageByPercentage 
-                ? d[columnNamePercentage]
-                : d[columnNameMB];
-            if (isNaN(diskUsage)) {
+            if (isNaN(d.disk_usage)) {
                 console.log('diskUsage is NaN', d);
             }
-            return yScale(diskUsage);
+            return yScale(d.disk_usage);
         })
         .curve(d3.curveStepAfter);
 
@@ -180,7 +194,8 @@ export function plotWorkerDiskUsage({ displayDiskUsageByPercentage = false, high
     let highlightedLine = null;
     if (highlightWorkerID) {
         d3.selectAll("path.line").each(function() {
-            const workerID = +d3.select(this).datum()[0].worker_id;
+            const points = d3.select(this).datum();
+            const workerID = points.length ? points[0].worker_id : null;
             if (workerID === highlightWorkerID) {
                 d3.select(this).raise();
                 highlightedLine = d3.select(this);
@@ -201,7 +216,7 @@ export function plotWorkerDiskUsage({ displayDiskUsageByPercentage = false, high
 
             lineData.forEach(point => {
                 const pointX = point['when_stage_in_or_out'] - window.minTime;
-                const pointY = point['disk_usage(MB)'];
+                const pointY = point.disk_usage;
     
                 const distance = Math.sqrt(Math.pow(positionX - pointX, 2) + Math.pow(positionY - pointY, 2));
 
@@ -213,14 +228,12 @@ export function plotWorkerDiskUsage({ displayDiskUsageByPercentage = false, high
     
             if (closestPoint) {
                 const pointX = xScale(closestPoint['when_stage_in_or_out'] - window.minTime);
-                const pointY = yScale(closestPoint[displayDiskUsageByPercentage ? columnNamePercentage : columnNameMB]);
+                const pointY = yScale(closestPoint.disk_usage);
                 tooltip.innerHTML = `
                     worker id: ${closestPoint.worker_id}<br>
-                    filename: ${closestPoint.filename}<br>
                     time from start: ${(+closestPoint.when_stage_in_or_out - window.minTime).toFixed(2)}s<br>
                     time in human: ${formatUnixTimestamp(+closestPoint.when_stage_in_or_out)}<br>
-                    disk contribute: ${(+closestPoint['size(MB)']).toFixed(4)}MB<br>
-                    disk usage: ${(+closestPoint[displayDiskUsageByPercentage ? columnNamePercentage : columnNameMB]).toFixed(2)}${displayDiskUsageByPercentage ? '%' : 'MB'}<br>
+                    disk usage: ${(+closestPoint.disk_usage).toFixed(2)}${displayDiskUsageByPercentage ? '%' : 'MB'}<br>
                 `;
 
                 tooltip.style.visibility = 'visible';
@@ -268,7 +281,7 @@ buttonDisplayAccumulatedOnly.addEventListener('click', async function() {
 
 function getHighlightWorkerID() {
     let workerID = document.getElementById('input-highlight-worker-disk-usage').value;
-    if (!window.workerDiskUpdate.some(d => +d.worker_id === +workerID)) {
+    if (!window.workerSummary.some(d => +d.worker_id === +workerID)) {
         workerID = null;
     } else {
         workerID = +workerID;